@@ -0,0 +1,129 @@
+import argparse, collections, itertools, json, os, pathlib, sys
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+import full_replay_parser
+
+CHUNK_SIZE = 16
+
+
+def parse_one(replay_path, only_head=True):
+    result = {'path': str(replay_path), 'error': None}
+    try:
+        if not pathlib.Path(replay_path).is_file():
+            raise FileNotFoundError(replay_path)
+        replay = full_replay_parser.ReplayWotParse(replay_path, only_head)
+        result['summary'] = replay.get_summary()
+        if not only_head:
+            result['packet_count'] = len(replay.get_packet_index()['offset'])
+    except Exception as error:
+        result['error'] = '%s: %s' % (type(error).__name__, error)
+    return result
+
+
+def parse_chunk(replay_paths, only_head=True):
+    return [parse_one(replay_path, only_head) for replay_path in replay_paths]
+
+
+def error_results(replay_paths, error):
+    return [{'path': replay_path, 'error': '%s: %s' % (type(error).__name__, error)} for replay_path in replay_paths]
+
+
+def parse_isolated(replay_paths, only_head=True):
+    # Run each path alone in a one-worker pool, so a file that kills its worker is the only one
+    # reported. parse_many only sends single paths here that were in flight when a pool died.
+    executor = ProcessPoolExecutor(1)
+    try:
+        for replay_path in replay_paths:
+            try:
+                result = executor.submit(parse_chunk, [replay_path], only_head).result()[0]
+            except BrokenProcessPool as error:
+                result = error_results([replay_path], error)[0]
+                executor.shutdown()
+                executor = ProcessPoolExecutor(1)
+            yield result
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def parse_many(replay_paths, workers=None, only_head=True, chunk_size=CHUNK_SIZE):
+    workers = workers or os.cpu_count() or 1
+    replay_paths = iter(replay_paths)
+    executor = ProcessPoolExecutor(workers)
+    pending = {}
+    retry = collections.deque()
+
+    def submit():
+        if retry:
+            chunk = retry.popleft()
+        else:
+            chunk = [str(replay_path) for replay_path in itertools.islice(replay_paths, chunk_size)]
+        if chunk:
+            pending[executor.submit(parse_chunk, chunk, only_head)] = chunk
+        return bool(chunk)
+
+    def fill():
+        for _ in range(workers * 2 - len(pending)):
+            if not submit(): break
+
+    try:
+        fill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            broken = any(isinstance(future.exception(), BrokenProcessPool) for future in done)
+            if broken:
+                # A dead worker breaks the whole pool: every chunk still in flight fails with it.
+                done, _ = wait(pending)
+            isolated = []
+            for future in done:
+                chunk = pending.pop(future)
+                try:
+                    results = future.result()
+                except BrokenProcessPool:
+                    # Bisect the chunks that were in flight and retry the halves across a fresh
+                    # pool; single paths left over are run on their own to find the culprit.
+                    if len(chunk) > 1:
+                        retry.extend((chunk[:len(chunk) // 2], chunk[len(chunk) // 2:]))
+                    else:
+                        isolated.extend(chunk)
+                    continue
+                except Exception as error:
+                    results = error_results(chunk, error)
+                for result in results:
+                    yield result
+            if broken:
+                executor.shutdown(cancel_futures=True)
+                if isolated:
+                    yield from parse_isolated(isolated, only_head)
+                executor = ProcessPoolExecutor(workers)
+            fill()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def find_replays(paths):
+    for path in paths:
+        path = pathlib.Path(path)
+        if path.is_dir():
+            yield from sorted(path.rglob('*.wotreplay'))
+        else:
+            yield path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Parse many World of Tanks replays in parallel.')
+    parser.add_argument('paths', nargs='+', help='replay files or directories to scan for *.wotreplay')
+    parser.add_argument('-w', '--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--full', action='store_true', help='also decrypt and index the gameplay section')
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for result in parse_many(find_replays(args.paths), args.workers, not args.full, args.chunk_size):
+        if result['error']:
+            failed += 1
+        sys.stdout.write(json.dumps(result) + '\n')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
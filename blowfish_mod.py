@@ -1,3 +1,19 @@
+from array import array
+
+numpy = False
+
+
+def load_numpy():
+    global numpy
+    if numpy is False:
+        try:
+            import numpy as numpy_module
+        except ImportError:
+            numpy_module = None
+        numpy = numpy_module
+    return numpy
+
+
 class Blowfish:
     ENCRYPT = 0
     DECRYPT = 1
@@ -303,6 +319,21 @@ class Blowfish:
                 self.s_boxes[i][j] = l
                 self.s_boxes[i][j + 1] = r
 
+    @classmethod
+    def from_schedule(cls, schedule):
+        if len(schedule) != 18 + 4 * 256:
+            raise RuntimeError("Attempted to load Blowfish key schedule of invalid length: %s" % len(schedule))
+        blowfish = cls.__new__(cls)
+        blowfish.p_boxes = list(schedule[:18])
+        blowfish.s_boxes = [list(schedule[18 + i * 256:18 + (i + 1) * 256]) for i in range(4)]
+        return blowfish
+
+    def schedule(self):
+        table = array('I', self.p_boxes)
+        for s_box in self.s_boxes:
+            table.extend(s_box)
+        return table
+
     def cipher(self, xl, xr, direction):
         if direction == self.ENCRYPT:
             for i in range(16):
@@ -365,6 +396,58 @@ class Blowfish:
         ])
         return chars
 
+    def encrypt_blocks(self, buffer):
+        if len(buffer) % 8:
+            raise RuntimeError("Attempted to encrypt data of invalid block length: %s" % len(buffer))
+        return self.__cipher_blocks(buffer, self.ENCRYPT)
+
+    def decrypt_blocks(self, buffer):
+        if len(buffer) % 8:
+            raise RuntimeError("Attempted to decrypt data of invalid block length: %s" % len(buffer))
+        return self.__cipher_blocks(buffer, self.DECRYPT)
+
+    def __cipher_blocks(self, buffer, direction):
+        numpy = load_numpy()
+        if numpy is None:
+            block_func = self.encrypt if direction == self.ENCRYPT else self.decrypt
+            view = memoryview(buffer)
+            return b"".join([block_func(view[i:i + 8]) for i in range(0, len(view), 8)])
+
+        p_boxes, s_boxes = self.__vector_boxes()
+        blocks = numpy.frombuffer(buffer, dtype=">u4").astype(numpy.uint32).reshape(-1, 2)
+        xl = blocks[:, 0].copy()
+        xr = blocks[:, 1].copy()
+        if direction == self.ENCRYPT:
+            rounds, last = range(16), (16, 17)
+        else:
+            rounds, last = range(17, 1, -1), (1, 0)
+        for i in rounds:
+            xl ^= p_boxes[i]
+            xr ^= self.__vector_round_func(xl, s_boxes)
+            xl, xr = xr, xl
+        xl, xr = xr, xl
+        xr ^= p_boxes[last[0]]
+        xl ^= p_boxes[last[1]]
+        blocks[:, 0] = xl
+        blocks[:, 1] = xr
+        return blocks.astype(">u4").tobytes()
+
+    def __vector_boxes(self):
+        if getattr(self, "_vector_boxes", None) is None:
+            numpy = load_numpy()
+            self._vector_boxes = (
+                numpy.array(self.p_boxes, dtype=numpy.uint32),
+                numpy.array(self.s_boxes, dtype=numpy.uint32),
+            )
+        return self._vector_boxes
+
+    @staticmethod
+    def __vector_round_func(xl, s_boxes):
+        f = s_boxes[0][xl >> 24] + s_boxes[1][(xl >> 16) & 0xFF]
+        f ^= s_boxes[2][(xl >> 8) & 0xFF]
+        f += s_boxes[3][xl & 0xFF]
+        return f
+
     def blocksize(self):
         return 8
 
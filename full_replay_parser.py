@@ -1,34 +1,472 @@
 import datetime
-import struct, pathlib, json, operator, zlib, binascii
+import struct, pathlib, json, zlib, binascii, heapq, os, mmap, time, bisect, sys
+from array import array
 import blowfish_mod
+import replay_key_schedule
+import tank_catalog
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 LENGTH_STRUCT = struct.Struct("<i")
 CLOCK_STRUCT = struct.Struct("<f")
 CORD_STRUCT = struct.Struct("<fff")
 B_STRUCT = struct.Struct("b")
 C_STRUCT = struct.Struct("c")
+PACKET_HEADER_STRUCT = struct.Struct("<ii")
+NAME_LENGTH_STRUCT = struct.Struct(">i")
+POSITION_STRUCT = struct.Struct("<i6xi3f")
+ENTITY_CREATE_STRUCT = struct.Struct("<ii10x3f")
 BLOCK_LENGTH = 8
-CIPHER = blowfish_mod.Blowfish(b"\xDE\x72\xBE\xA0\xDE\x04\xBE\xB1\xDE\xFE\xBE\xEF\xDE\xAD\xBE\xEF")
-all_tanks = None
+PACKET_TABLE_DTYPE = [
+    ('clock', '<f4'), ('type', '<i4'), ('length', '<i4'), ('offset', '<i8'),
+    ('entity_id', '<i4'), ('x', '<f4'), ('y', '<f4'), ('z', '<f4'),
+]
+ENTITY_ID_FIELD = {1: 14, 4: 4, 5: 4, 6: 4, 7: 4}
+COORDINATE_FIELD = {1: 18, 5: 22}
+STREAM_CHUNK_SIZE = 1 << 20
+PARTIAL_CHUNK_SIZE = 1 << 16
+TIME_INDEX_STEP = 1.0
+TIME_INDEX_MAGIC = b"WTIX"
+TIME_INDEX_HEADER_STRUCT = struct.Struct("<4sdqq")
+BUFFER_TYPES = (bytes, bytearray, memoryview, mmap.mmap)
+PACKET_DECODERS = {}
+REPLAY_KEY = b"\xDE\x72\xBE\xA0\xDE\x04\xBE\xB1\xDE\xFE\xBE\xEF\xDE\xAD\xBE\xEF"
+replay_cipher = None
+
+
+def get_cipher():
+    global replay_cipher
+    if replay_cipher is None:
+        replay_cipher = blowfish_mod.Blowfish.from_schedule(replay_key_schedule.REPLAY_KEY_SCHEDULE)
+    return replay_cipher
+
+
+def __getattr__(name):
+    if name == 'CIPHER':
+        return get_cipher()
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def xor_chain(decrypted, previous_block=bytes(BLOCK_LENGTH)):
+    numpy = blowfish_mod.load_numpy()
+    chained = bytearray(len(decrypted))
+    if numpy is not None:
+        lanes = numpy.frombuffer(chained, dtype=numpy.uint64)
+        numpy.bitwise_xor.accumulate(numpy.frombuffer(decrypted, dtype=numpy.uint64), out=lanes)
+        lanes ^= numpy.frombuffer(previous_block, dtype=numpy.uint64)
+        return chained
+    previous = int.from_bytes(previous_block, 'little')
+    for cursor in range(0, len(decrypted), BLOCK_LENGTH):
+        previous ^= int.from_bytes(decrypted[cursor:cursor + BLOCK_LENGTH], 'little')
+        chained[cursor:cursor + BLOCK_LENGTH] = previous.to_bytes(BLOCK_LENGTH, 'little')
+    return chained
+
+
+def decode_head_blocks(read, blocks=(0,), fast_json=True):
+    wanted = None if blocks is None else set(blocks)
+    last_block = None if wanted is None else max(wanted, default=-1)
+    json_loads = orjson.loads if fast_json and orjson is not None else json.loads
+    data_head = []
+    header = read(0, 8)
+    if len(header) < 8: return data_head
+    offset = len(header)
+    for i in range(header[4]):
+        if last_block is not None and i > last_block: break
+        buffer = read(offset, LENGTH_STRUCT.size)
+        if len(buffer) < LENGTH_STRUCT.size: break
+        length = LENGTH_STRUCT.unpack(buffer)[0]
+        offset += LENGTH_STRUCT.size
+        if wanted is None or i in wanted:
+            data_head.append(json_loads(bytes(read(offset, length))))
+        offset += length
+    return data_head
+
+
+def read_head_blocks(replay_path, blocks=(0,), use_mmap=False, fast_json=True):
+    if isinstance(replay_path, BUFFER_TYPES):
+        view = memoryview(replay_path).cast('B')
+        return decode_head_blocks(lambda offset, size: view[offset:offset + size], blocks, fast_json)
+    with open(replay_path, 'rb', buffering=0) as replay:
+        if use_mmap and os.fstat(replay.fileno()).st_size:
+            with mmap.mmap(replay.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return decode_head_blocks(lambda offset, size: mapped[offset:offset + size], blocks, fast_json)
+        if hasattr(os, 'pread'):
+            return decode_head_blocks(lambda offset, size: os.pread(replay.fileno(), size, offset), blocks, fast_json)
+
+        def read(offset, size):
+            replay.seek(offset)
+            return replay.read(size)
+        return decode_head_blocks(read, blocks, fast_json)
+
+
+def gather_field(buffer, offsets, dtype, count=1):
+    numpy = blowfish_mod.load_numpy()
+    dtype = numpy.dtype(dtype)
+    rows = numpy.asarray(offsets, dtype=numpy.int64)[:, None] + numpy.arange(dtype.itemsize * count)
+    return numpy.frombuffer(buffer, dtype=numpy.uint8)[rows].view(dtype).reshape(len(rows), count)
+
+
+def register_packet_decoder(*packet_types):
+    def register(decoder):
+        for packet_type in packet_types:
+            PACKET_DECODERS[packet_type] = decoder
+        return decoder
+    return register
+
+
+def unpack_indexed_value(payload, cursor):
+    value_index = B_STRUCT.unpack_from(payload, cursor)[0]
+    cursor += B_STRUCT.size
+    value = None
+    if value_index == 75:
+        value = payload[cursor]
+        cursor += C_STRUCT.size
+    elif value_index == 74:
+        value = LENGTH_STRUCT.unpack_from(payload, cursor)[0]
+        cursor += LENGTH_STRUCT.size
+    return value, cursor
+
+
+@register_packet_decoder(0)
+def decode_battle_setup(payload, packet_data):
+    unknown_id = LENGTH_STRUCT.unpack_from(payload, 4)[0]
+    if unknown_id:
+        packet_data['unknown_id'] = unknown_id
+    name_len = NAME_LENGTH_STRUCT.unpack_from(payload, 15)[0]
+    cursor = 19
+    nick_name = bytes(payload[cursor:cursor + name_len]).decode("utf-8")
+    if nick_name:
+        packet_data['nick_name'] = nick_name
+    cursor += name_len
+
+    len_game_player_id = payload[cursor]
+    cursor += 1
+    game_player_id = int(bytes(payload[cursor:cursor + len_game_player_id]))
+    if game_player_id:
+        packet_data['game_player_id'] = game_player_id
+    cursor += len_game_player_id
+
+    timestamp_start = LENGTH_STRUCT.unpack_from(payload, cursor)[0]
+    if timestamp_start:
+        packet_data['timestamp_start'] = timestamp_start
+    cursor += LENGTH_STRUCT.size + 33
+
+    gameParamsRev = bytes(payload[cursor:cursor + 16]).decode("utf-8")
+    if gameParamsRev:
+        packet_data['gameParamsRev'] = gameParamsRev
+    cursor += 30
+
+    battleLevel, cursor = unpack_indexed_value(payload, cursor)
+    if battleLevel is not None:
+        packet_data['battleLevel'] = battleLevel
+    arenaTypeID, cursor = unpack_indexed_value(payload, cursor + 13)
+    if arenaTypeID is not None:
+        packet_data['arenaTypeID'] = arenaTypeID
+    arenaKind, cursor = unpack_indexed_value(payload, cursor + 11)
+    if arenaKind is not None:
+        packet_data['arenaKind'] = arenaKind
+
+
+@register_packet_decoder(1)
+def decode_position(payload, packet_data):
+    world_id, entity_id, x, y, z = POSITION_STRUCT.unpack_from(payload, 4)
+    if world_id:
+        packet_data['world_id'] = world_id
+    if entity_id:
+        packet_data['entity_id'] = entity_id
+    packet_data['coordinate'] = (x, y, z)
+
+
+@register_packet_decoder(2)
+def decode_world(payload, packet_data):
+    world_id = LENGTH_STRUCT.unpack_from(payload, 4)[0]
+    if world_id:
+        packet_data['world_id'] = world_id
+
+
+@register_packet_decoder(4, 6, 7)
+def decode_entity(payload, packet_data):
+    entity_id = LENGTH_STRUCT.unpack_from(payload, 4)[0]
+    if entity_id:
+        packet_data['entity_id'] = entity_id
+
+
+@register_packet_decoder(5)
+def decode_entity_create(payload, packet_data):
+    entity_id, entity_type, x, y, z = ENTITY_CREATE_STRUCT.unpack_from(payload, 4)
+    if entity_id:
+        packet_data['entity_id'] = entity_id
+    if entity_type:
+        packet_data['entity_type'] = entity_type
+    packet_data['coordinate'] = (x, y, z)
+    if entity_type == 6:
+        type_byte = B_STRUCT.unpack_from(payload, 61)[0]
+        cursor = 62
+        len_nickname = None
+        if type_byte == 12:
+            len_nickname = B_STRUCT.unpack_from(payload, cursor + 3)[0]
+            cursor += 3 + B_STRUCT.size
+        elif type_byte == 20:
+            len_nickname = B_STRUCT.unpack_from(payload, cursor)[0]
+            cursor += B_STRUCT.size
+        if len_nickname:
+            nick_name = bytes(payload[cursor:cursor + len_nickname])
+            if nick_name:
+                packet_data['nick_name'] = nick_name
+
+
+@register_packet_decoder(35)
+def decode_chat(payload, packet_data):
+    len_text = LENGTH_STRUCT.unpack_from(payload, 4)[0]
+    message_user = bytes(payload[8:8 + len_text]).decode()
+    if message_user:
+        packet_data['message_user'] = message_user
+
+
+class BufferReader(object):
+    def __init__(self, buffer):
+        self.buffer = memoryview(buffer).cast('B')
+        self.position = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def read(self, size=-1):
+        start = self.position
+        if size is None or size < 0:
+            self.position = len(self.buffer)
+        else:
+            self.position = min(start + size, len(self.buffer))
+        return self.buffer[start:self.position]
+
+    def seek(self, position, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            position += self.position
+        elif whence == os.SEEK_END:
+            position += len(self.buffer)
+        self.position = max(0, position)
+        return self.position
+
+    def tell(self):
+        return self.position
+
+    def close(self):
+        self.buffer.release()
+
+
+class ParseStats(object):
+    def __init__(self, hook=None):
+        self.hook = hook
+        self.stages = {}
+        self.packet_counts = {}
+        self.packet_decode_time = {}
+        self.dropped_head_blocks = 0
+
+    def start(self):
+        return time.perf_counter(), time.process_time()
+
+    def stop(self, stage, started, processed_bytes=0):
+        wall = time.perf_counter() - started[0]
+        cpu = time.process_time() - started[1]
+        if stage not in self.stages:
+            self.stages[stage] = {'wall': 0.0, 'cpu': 0.0, 'bytes': 0, 'calls': 0}
+        totals = self.stages[stage]
+        totals['wall'] += wall
+        totals['cpu'] += cpu
+        totals['bytes'] += processed_bytes
+        totals['calls'] += 1
+        if self.hook is not None:
+            self.hook(stage, wall, cpu, processed_bytes)
+
+    def add_packet(self, packet_type, elapsed=0.0):
+        self.packet_counts[packet_type] = self.packet_counts.get(packet_type, 0) + 1
+        self.packet_decode_time[packet_type] = self.packet_decode_time.get(packet_type, 0.0) + elapsed
+
+    def as_dict(self):
+        return {
+            'stages': {stage: dict(totals) for stage, totals in self.stages.items()},
+            'packet_counts': dict(self.packet_counts),
+            'packet_decode_time': dict(self.packet_decode_time),
+            'dropped_head_blocks': self.dropped_head_blocks,
+        }
+
+
+class Packet(object):
+    __slots__ = ('replay', 'offset', 'packet_type', 'payload_length', 'clock')
+    FIELDS = ('payload_length', 'packet_type', 'packet_data', 'payload')
+
+    def __init__(self, replay, offset, packet_type, payload_length, clock):
+        self.replay = replay
+        self.offset = offset
+        self.packet_type = packet_type
+        self.payload_length = payload_length
+        self.clock = clock
+
+    @property
+    def payload(self):
+        cursor = self.offset + PACKET_HEADER_STRUCT.size
+        return memoryview(self.replay.data_gameplay)[cursor:cursor + self.payload_length + 4]
+
+    @property
+    def packet_data(self):
+        return self.replay.decode_packet(self.payload, self.packet_type, self.payload_length)
+
+    def keys(self):
+        return Packet.FIELDS
+
+    def __getitem__(self, key):
+        if key == 'payload':
+            return bytes(self.payload)
+        if key in Packet.FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in Packet.FIELDS
+
+    def __repr__(self):
+        return 'Packet(offset=%s, packet_type=%s, payload_length=%s, clock=%s)' % (
+            self.offset, self.packet_type, self.payload_length, self.clock)
+
+
+class HeaderIndex(object):
+    def __init__(self, data_head):
+        self.roster = {}
+        self.roster_order = []
+        self.team_members = {}
+        self.battle_results = {}
+        self.account_avatar = {}
+        self.player_id = None
+        self.player_name = None
+        self.player_avatar_id = None
+        self.player_team_id = None
+        self.winner_team = None
+        self.has_winner_team = False
+
+        player_nick_name = None
+        team_found = False
+        for block in data_head:
+            if type(block) is dict:
+                if 'playerID' in block:
+                    self.player_id = block['playerID']
+                if 'playerName' in block:
+                    self.player_name = player_nick_name = block['playerName']
+                for avatar_id, vehicle in block.get('vehicles', {}).items():
+                    self.roster[avatar_id] = vehicle
+                    if 'team' in vehicle:
+                        self.roster_order.append((avatar_id, vehicle['team']))
+                        self.team_members.setdefault(vehicle['team'], []).append(avatar_id)
+                    if player_nick_name and not team_found and 'name' in vehicle and player_nick_name == vehicle['name']:
+                        self.player_team_id = vehicle.get('team')
+                        team_found = True
+            if type(block) is list:
+                for result in block:
+                    if 'common' in result and 'winnerTeam' in result['common'] and not self.has_winner_team:
+                        self.winner_team = result['common']['winnerTeam']
+                        self.has_winner_team = True
+                    for avatar_id, tank_results in result.get('vehicles', {}).items():
+                        self.battle_results[avatar_id] = tank_results
+                        for tank_result in tank_results:
+                            if 'accountDBID' in tank_result:
+                                self.account_avatar[tank_result['accountDBID']] = avatar_id
+        if self.player_name:
+            for avatar_id, vehicle in self.roster.items():
+                if 'name' in vehicle and self.player_name == vehicle['name']:
+                    self.player_avatar_id = avatar_id
+
+    def get_player_info_by_avatar_id(self, avatar_id):
+        user_data = {}
+        if avatar_id in self.roster:
+            user_data['game_player_id'] = avatar_id
+            user_data['info'] = self.roster[avatar_id]
+        if avatar_id in self.battle_results:
+            user_data['battle_info'] = self.battle_results[avatar_id]
+        return user_data
+
 
 class ReplayWotParse(object):
-    def __init__(self, replay_path, only_head=True):
-        if not replay_path: return
-        self.replay_path = pathlib.Path(replay_path)
+    def __init__(self, replay_path, only_head=True, gameplay_cache=None, stats=None, keep_source=False):
+        if replay_path is None or isinstance(replay_path, (str, bytes)) and not replay_path: return
+        self.replay_path = None
+        self.replay_source = None
+        # Buffer and file-like sources are released once the head/gameplay are read, so the
+        # caller can close an mmap or free an upload. Pass keep_source=True to stream from them
+        # later with iter_gameplay() / decode_gameplay_partial(); path sources are reopened.
+        self.keep_source = keep_source
+        if isinstance(replay_path, BUFFER_TYPES):
+            self.replay_source = memoryview(replay_path).cast('B')
+        elif hasattr(replay_path, 'read'):
+            self.replay_source = replay_path
+        else:
+            self.replay_path = pathlib.Path(replay_path)
         self.is_full_match = False
         self.is_only_head = only_head
         self.data_head = []
-
-        if not self.replay_path.is_file(): return
-        self.full_replay = open(self.replay_path, 'rb')
-        self.read_replay_head()
-        if not only_head:
-            self.magic = binascii.hexlify(self.full_replay.read(4))
-            self.data_gameplay = b''
-            self.decode_gameplay_list = []
-            self.read_replay_gameplay()
-            self.cursor = 0
-        self.full_replay.close()
+        self.packet_index = None
+        self.header_index = None
+        self.time_index = None
+        self.gameplay_cache = gameplay_cache
+        self.stats = ParseStats() if stats is True else stats or None
+
+        if self.replay_path is not None and not self.replay_path.is_file(): return
+        self.full_replay = self.open_replay()
+        try:
+            self.read_replay_head()
+            if not only_head:
+                self.magic = binascii.hexlify(self.full_replay.read(4))
+                self.data_gameplay = b''
+                self.decode_gameplay_list = []
+                self.read_replay_gameplay()
+                self.cursor = 0
+        finally:
+            if self.full_replay is not self.replay_source:
+                self.full_replay.close()
+            if not keep_source:
+                self.release_source()
+
+    @classmethod
+    def from_head(cls, data_head, replay_path=None):
+        replay = cls(None)
+        replay.replay_path = pathlib.Path(replay_path) if replay_path else None
+        replay.replay_source = None
+        replay.keep_source = False
+        replay.is_only_head = True
+        replay.data_head = data_head
+        replay.is_full_match = len(data_head) == 2
+        replay.packet_index = None
+        replay.header_index = None
+        replay.time_index = None
+        replay.gameplay_cache = None
+        replay.stats = None
+        return replay
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('full_replay', None)
+        state['replay_source'] = None
+        if isinstance(state.get('data_gameplay'), mmap.mmap):
+            state['data_gameplay'] = bytes(state['data_gameplay'])
+        return state
+
+    def open_replay(self):
+        if self.replay_path is not None:
+            return open(self.replay_path, 'rb')
+        if self.replay_source is None:
+            raise RuntimeError("Replay source was released after parsing, pass keep_source=True to stream it")
+        if isinstance(self.replay_source, memoryview):
+            return BufferReader(self.replay_source)
+        return self.replay_source
+
+    def release_source(self):
+        if isinstance(self.replay_source, memoryview):
+            self.replay_source.release()
+        self.replay_source = None
 
     def read_replay_head_length(self):
         buffer = self.full_replay.read(LENGTH_STRUCT.size)
@@ -37,33 +475,141 @@ class ReplayWotParse(object):
         return LENGTH_STRUCT.unpack(buffer)[0]
 
     def read_replay_head(self):
+        stats = self.stats
+        if stats is not None: started = stats.start()
         header = self.full_replay.read(len(b"\x12\x32\x34\x11\x02\x00\x00\x00"))
         json_block_count = header[4]
         for i in range(json_block_count):
             try:
                 length = self.read_replay_head_length()
-                json_data = json.loads(self.full_replay.read(length))
+                json_data = json.loads(bytes(self.full_replay.read(length)))
                 self.data_head.append(json_data)
             except:
-                pass
+                if stats is not None: stats.dropped_head_blocks += 1
         if len(self.data_head) == 2:
             self.is_full_match = True
+        try:
+            self.gameplay_offset = self.full_replay.tell()
+        except (OSError, ValueError):
+            self.gameplay_offset = None
+        if stats is not None: stats.stop('head', started, self.gameplay_offset or 0)
 
     def read_replay_gameplay(self):
-        blocks = []
-        previous_block = bytes(BLOCK_LENGTH)
-        length = self.read_replay_head_length()
-        while True:
-            block = self.full_replay.read(BLOCK_LENGTH)
-            if not block:
-                break
-            if len(block) < BLOCK_LENGTH:
-                block += b'\x00' * (BLOCK_LENGTH - len(block))
-            block = CIPHER.decrypt(block)
-            block = bytes(map(operator.xor, block, previous_block))
-            previous_block = block
-            blocks.append(block)
-        self.data_gameplay = zlib.decompress(b"".join(blocks)[:length])
+        stats = self.stats
+        if stats is not None: started = stats.start()
+        length_data = self.full_replay.read(LENGTH_STRUCT.size)
+        if not length_data:
+            raise StopIteration()
+        length = LENGTH_STRUCT.unpack(length_data)[0]
+        encrypted = self.full_replay.read()
+        if stats is not None: stats.stop('read', started, len(encrypted))
+        cache_key = None
+        if self.gameplay_cache is not None:
+            if stats is not None: started = stats.start()
+            cache_key = self.gameplay_cache.key(length_data, encrypted)
+            cached = self.gameplay_cache.load(cache_key)
+            if stats is not None: stats.stop('cache_lookup', started, len(encrypted))
+            if cached is not None:
+                self.data_gameplay = cached
+                return
+        if len(encrypted) % BLOCK_LENGTH:
+            encrypted = bytes(encrypted) + b'\x00' * (BLOCK_LENGTH - len(encrypted) % BLOCK_LENGTH)
+        if stats is not None: started = stats.start()
+        decrypted = get_cipher().decrypt_blocks(encrypted)
+        if stats is not None:
+            stats.stop('decrypt', started, len(encrypted))
+            started = stats.start()
+        decrypted = xor_chain(decrypted)
+        if stats is not None:
+            stats.stop('xor_chain', started, len(decrypted))
+            started = stats.start()
+        self.data_gameplay = zlib.decompress(memoryview(decrypted)[:length])
+        if stats is not None: stats.stop('decompress', started, len(self.data_gameplay))
+        if cache_key is not None:
+            self.gameplay_cache.store(cache_key, self.data_gameplay)
+
+    def iter_gameplay(self, chunk_size=STREAM_CHUNK_SIZE):
+        chunk_size = max(chunk_size - chunk_size % BLOCK_LENGTH, BLOCK_LENGTH)
+        stats = self.stats
+        replay = self.open_replay()
+        try:
+            replay.seek(self.gameplay_offset + 4)
+            length = LENGTH_STRUCT.unpack(replay.read(LENGTH_STRUCT.size))[0]
+            decompressor = zlib.decompressobj()
+            previous_block = bytes(BLOCK_LENGTH)
+            while length > 0 and not decompressor.eof:
+                if stats is not None: started = stats.start()
+                encrypted = replay.read(chunk_size)
+                if stats is not None: stats.stop('read', started, len(encrypted))
+                if not encrypted:
+                    break
+                if len(encrypted) % BLOCK_LENGTH:
+                    encrypted = bytes(encrypted) + b'\x00' * (BLOCK_LENGTH - len(encrypted) % BLOCK_LENGTH)
+                if stats is not None: started = stats.start()
+                decrypted = get_cipher().decrypt_blocks(encrypted)
+                if stats is not None:
+                    stats.stop('decrypt', started, len(encrypted))
+                    started = stats.start()
+                decrypted = xor_chain(decrypted, previous_block)
+                if stats is not None: stats.stop('xor_chain', started, len(decrypted))
+                previous_block = bytes(decrypted[-BLOCK_LENGTH:])
+                data = memoryview(decrypted)[:length]
+                length -= len(data)
+                while data:
+                    if stats is not None: started = stats.start()
+                    chunk = decompressor.decompress(data, chunk_size)
+                    if stats is not None: stats.stop('decompress', started, len(chunk))
+                    if chunk:
+                        yield chunk
+                    data = decompressor.unconsumed_tail
+            chunk = decompressor.flush()
+            if chunk:
+                yield chunk
+        finally:
+            if replay is not self.replay_source:
+                replay.close()
+
+    def iter_stream_packets(self, chunk_size=STREAM_CHUNK_SIZE):
+        buffer = bytearray()
+        offset = 0
+        for chunk in self.iter_gameplay(chunk_size):
+            buffer += chunk
+            cursor = 0
+            while len(buffer) - cursor >= PACKET_HEADER_STRUCT.size:
+                payload_length, packet_type = PACKET_HEADER_STRUCT.unpack_from(buffer, cursor)
+                if payload_length + 4 <= 0: return
+                end = cursor + PACKET_HEADER_STRUCT.size + payload_length + 4
+                if end > len(buffer): break
+                yield offset + cursor, packet_type, payload_length, bytes(buffer[cursor + PACKET_HEADER_STRUCT.size:end])
+                cursor = end
+            del buffer[:cursor]
+            offset += cursor
+
+    def decode_gameplay_partial(self, max_clock=None, max_packets=None, until=None, packet_types=None,
+                                chunk_size=PARTIAL_CHUNK_SIZE):
+        self.decode_gameplay_list = []
+        packets = self.iter_stream_packets(chunk_size)
+        try:
+            for offset, packet_type, payload_length, payload in packets:
+                if max_clock is not None and len(payload) >= CLOCK_STRUCT.size and \
+                        CLOCK_STRUCT.unpack_from(payload)[0] > max_clock:
+                    break
+                if packet_types is not None and packet_type not in packet_types:
+                    continue
+                packet = {
+                    'payload_length': payload_length,
+                    'packet_type': packet_type,
+                    'packet_data': self.decode_packet(payload, packet_type, payload_length),
+                    'payload': payload,
+                }
+                self.decode_gameplay_list.append(packet)
+                if max_packets is not None and len(self.decode_gameplay_list) >= max_packets:
+                    break
+                if until is not None and until(packet):
+                    break
+        finally:
+            packets.close()
+        return self.decode_gameplay_list
 
     def read_gameplay_length(self, length=LENGTH_STRUCT.size):
         if len(self.data_gameplay) <= self.cursor: return None
@@ -72,192 +618,227 @@ class ReplayWotParse(object):
         if not buffer: return None
         return buffer
 
-    def decode_gameplay(self):
+    def iter_packet_headers(self, start=0):
+        if not self.data_gameplay: return
+        data = memoryview(self.data_gameplay)
+        data_length = len(data)
+        cursor = start
+        while cursor + PACKET_HEADER_STRUCT.size <= data_length:
+            payload_length, packet_type = PACKET_HEADER_STRUCT.unpack_from(data, cursor)
+            if cursor + PACKET_HEADER_STRUCT.size >= data_length or payload_length + 4 <= 0: break
+            yield cursor, packet_type, payload_length
+            cursor += PACKET_HEADER_STRUCT.size + payload_length + 4
+
+    def build_packet_index(self):
+        offsets, packet_types, payload_lengths = array('q'), array('i'), array('i')
+        by_type = {}
+        for position, (offset, packet_type, payload_length) in enumerate(self.iter_packet_headers()):
+            offsets.append(offset)
+            packet_types.append(packet_type)
+            payload_lengths.append(payload_length)
+            if packet_type not in by_type:
+                by_type[packet_type] = array('i')
+            by_type[packet_type].append(position)
+        self.packet_index = {
+            'offset': offsets,
+            'packet_type': packet_types,
+            'payload_length': payload_lengths,
+            'by_type': by_type,
+        }
+        return self.packet_index
+
+    def get_packet_index(self):
+        if self.packet_index is None:
+            self.build_packet_index()
+        return self.packet_index
+
+    def iter_packets(self, packet_types=None, start=0):
+        if not self.data_gameplay: return
+        data = memoryview(self.data_gameplay)
+        if packet_types is None:
+            for offset, packet_type, payload_length in self.iter_packet_headers(start):
+                cursor = offset + PACKET_HEADER_STRUCT.size
+                yield offset, packet_type, payload_length, data[cursor:cursor + payload_length + 4]
+            return
+        index = self.get_packet_index()
+        offsets, payload_lengths, by_type = index['offset'], index['payload_length'], index['by_type']
+        positions = [by_type[packet_type] for packet_type in set(packet_types) if packet_type in by_type]
+        if start:
+            first = bisect.bisect_left(offsets, start)
+            positions = [position_list[bisect.bisect_left(position_list, first):] for position_list in positions]
+        for position in heapq.merge(*positions):
+            offset = offsets[position]
+            payload_length = payload_lengths[position]
+            cursor = offset + PACKET_HEADER_STRUCT.size
+            yield offset, index['packet_type'][position], payload_length, data[cursor:cursor + payload_length + 4]
+
+    def build_time_index(self, step=TIME_INDEX_STEP):
+        data = memoryview(self.data_gameplay) if self.data_gameplay else memoryview(b'')
+        clocks, offsets = array('d'), array('q')
+        max_clock = None
+        next_clock = None
+        for offset, packet_type, payload_length in self.iter_packet_headers():
+            if offset + PACKET_HEADER_STRUCT.size + CLOCK_STRUCT.size > len(data): break
+            clock = CLOCK_STRUCT.unpack_from(data, offset + PACKET_HEADER_STRUCT.size)[0]
+            if max_clock is None or clock > max_clock:
+                max_clock = clock
+            if next_clock is None or max_clock >= next_clock:
+                clocks.append(max_clock)
+                offsets.append(offset)
+                next_clock = max_clock + step
+        self.time_index = {'step': step, 'clock': clocks, 'offset': offsets, 'data_length': len(data)}
+        return self.time_index
+
+    def get_time_index(self):
+        if self.time_index is None:
+            self.build_time_index()
+        return self.time_index
+
+    def time_index_path(self):
+        if self.replay_path is None: return None
+        return self.replay_path.with_name(self.replay_path.name + '.tidx')
+
+    def save_time_index(self, index_path=None):
+        index_path = index_path or self.time_index_path()
+        if index_path is None:
+            raise ValueError("Replay was not read from a path, pass index_path to save the time index")
+        time_index = self.get_time_index()
+        clocks, offsets = array('d', time_index['clock']), array('q', time_index['offset'])
+        if sys.byteorder != 'little':
+            clocks.byteswap()
+            offsets.byteswap()
+        with open(index_path, 'wb') as index_file:
+            index_file.write(TIME_INDEX_HEADER_STRUCT.pack(
+                TIME_INDEX_MAGIC, time_index['step'], time_index['data_length'], len(clocks)))
+            index_file.write(clocks.tobytes())
+            index_file.write(offsets.tobytes())
+        return index_path
+
+    def load_time_index(self, index_path=None):
+        index_path = index_path or self.time_index_path()
+        try:
+            with open(index_path, 'rb') as index_file:
+                data = index_file.read()
+        except (OSError, TypeError):
+            return None
+        if len(data) < TIME_INDEX_HEADER_STRUCT.size: return None
+        magic, step, data_length, count = TIME_INDEX_HEADER_STRUCT.unpack_from(data)
+        data_gameplay_length = len(self.data_gameplay) if self.data_gameplay else 0
+        if magic != TIME_INDEX_MAGIC or data_length != data_gameplay_length: return None
+        if len(data) != TIME_INDEX_HEADER_STRUCT.size + count * 16: return None
+        clocks, offsets = array('d'), array('q')
+        clocks.frombytes(data[TIME_INDEX_HEADER_STRUCT.size:TIME_INDEX_HEADER_STRUCT.size + count * 8])
+        offsets.frombytes(data[TIME_INDEX_HEADER_STRUCT.size + count * 8:])
+        if sys.byteorder != 'little':
+            clocks.byteswap()
+            offsets.byteswap()
+        self.time_index = {'step': step, 'clock': clocks, 'offset': offsets, 'data_length': data_length}
+        return self.time_index
+
+    def seek(self, clock):
+        time_index = self.get_time_index()
+        position = bisect.bisect_left(time_index['clock'], clock) - 1
+        start = time_index['offset'][position] if position >= 0 else 0
+        data = memoryview(self.data_gameplay) if self.data_gameplay else memoryview(b'')
+        for offset, packet_type, payload_length in self.iter_packet_headers(start):
+            if offset + PACKET_HEADER_STRUCT.size + CLOCK_STRUCT.size > len(data): break
+            if CLOCK_STRUCT.unpack_from(data, offset + PACKET_HEADER_STRUCT.size)[0] >= clock:
+                return offset
+        return None
+
+    def packets_between(self, start_clock, end_clock, packet_types=None):
+        start = self.seek(start_clock)
+        if start is None: return
+        for offset, packet_type, payload_length, payload in self.iter_packets(packet_types, start):
+            if len(payload) < CLOCK_STRUCT.size: break
+            clock = CLOCK_STRUCT.unpack_from(payload)[0]
+            if clock > end_clock: break
+            if clock >= start_clock:
+                yield offset, packet_type, payload_length, payload
+
+    def decode_gameplay(self, packet_types=None, compact=False):
         if not self.data_gameplay: return []
+        stats = self.stats
+        if stats is not None: started = stats.start()
         self.cursor = 0
         self.decode_gameplay_list = []
-        while True:
-            payload_length_data = self.read_gameplay_length()
-            packet_type_data = self.read_gameplay_length()
-            if payload_length_data is None or packet_type_data is None: break
-            payload_length = LENGTH_STRUCT.unpack(payload_length_data)[0]
-            packet_type = LENGTH_STRUCT.unpack(packet_type_data)[0]
-            payload = self.read_gameplay_length(payload_length+4)
-            if payload is None: break
+        for offset, packet_type, payload_length, payload in self.iter_packets(packet_types):
+            if compact:
+                clock = CLOCK_STRUCT.unpack_from(payload)[0] if len(payload) >= CLOCK_STRUCT.size else None
+                self.decode_gameplay_list.append(Packet(self, offset, packet_type, payload_length, clock))
+                if stats is not None: stats.add_packet(packet_type)
+                continue
             # clock = CLOCK_STRUCT.unpack(payload[0:4])[0]
             # print(f'{payload_length:^5}', f'{packet_type:^5}', f'{clock:^5}', payload[:50])
+            if stats is not None: packet_started = time.perf_counter()
             packet_data = self.decode_packet(payload, packet_type, payload_length)
+            if stats is not None: stats.add_packet(packet_type, time.perf_counter() - packet_started)
             self.decode_gameplay_list.append(
                 {
                     'payload_length': payload_length,
                     'packet_type': packet_type,
                     'packet_data': packet_data,
-                    'payload': payload,
+                    'payload': bytes(payload),
                 })
+        if stats is not None: stats.stop('decode', started, len(self.data_gameplay))
+
+    def packet_table(self, packet_types=None):
+        numpy = blowfish_mod.load_numpy()
+        if numpy is None:
+            raise ImportError("numpy is required to build the packet table")
+        index = self.get_packet_index()
+        offsets = numpy.frombuffer(index['offset'], dtype=numpy.int64)
+        packet_types_column = numpy.frombuffer(index['packet_type'], dtype=numpy.int32)
+        payload_lengths = numpy.frombuffer(index['payload_length'], dtype=numpy.int32)
+        if packet_types is not None:
+            selected = numpy.isin(packet_types_column, list(packet_types))
+            offsets, packet_types_column, payload_lengths = \
+                offsets[selected], packet_types_column[selected], payload_lengths[selected]
+
+        table = numpy.zeros(len(offsets), dtype=PACKET_TABLE_DTYPE)
+        table['type'] = packet_types_column
+        table['length'] = payload_lengths
+        table['offset'] = offsets
+        table['x'] = table['y'] = table['z'] = numpy.nan
+        payloads = offsets + PACKET_HEADER_STRUCT.size
+        if len(offsets):
+            table['clock'] = gather_field(self.data_gameplay, payloads, '<f4')[:, 0]
+        for packet_type, field in ENTITY_ID_FIELD.items():
+            rows = numpy.nonzero((packet_types_column == packet_type) & (payload_lengths >= field))[0]
+            if len(rows):
+                table['entity_id'][rows] = gather_field(self.data_gameplay, payloads[rows] + field, '<i4')[:, 0]
+        for packet_type, field in COORDINATE_FIELD.items():
+            rows = numpy.nonzero((packet_types_column == packet_type) &
+                                 (payload_lengths + 4 >= field + CORD_STRUCT.size))[0]
+            if len(rows):
+                coordinates = gather_field(self.data_gameplay, payloads[rows] + field, '<f4', 3)
+                table['x'][rows] = coordinates[:, 0]
+                table['y'][rows] = coordinates[:, 1]
+                table['z'][rows] = coordinates[:, 2]
+        return table
+
+    def extract_tracks(self, packet_types=(1, 5)):
+        numpy = blowfish_mod.load_numpy()
+        if numpy is None:
+            raise ImportError("numpy is required to extract position tracks")
+        table = self.packet_table(packet_types)
+        table = table[(table['entity_id'] != 0) & ~numpy.isnan(table['x'])]
+        order = numpy.argsort(table['entity_id'], kind='stable')
+        entity_ids = table['entity_id'][order]
+        columns = {field: table[field][order] for field in ('clock', 'x', 'y', 'z')}
+        entity_list, starts = numpy.unique(entity_ids, return_index=True)
+        ends = list(starts[1:]) + [len(entity_ids)]
+        return {
+            int(entity_id): {field: column[start:end] for field, column in columns.items()}
+            for entity_id, start, end in zip(entity_list, starts, ends)
+        }
 
     def decode_packet(self, payload, packet_type, payload_length=None):
         if not payload or packet_type is None: return {}
-        temp_data = {}
-        cursor = 0
-        clock = CLOCK_STRUCT.unpack(payload[cursor:cursor+CLOCK_STRUCT.size])[0]
-        if clock is not None:
-            temp_data['clock'] = clock
-        cursor += CLOCK_STRUCT.size
-        if packet_type == 0:
-            edited = payload[cursor:cursor + LENGTH_STRUCT.size]
-            unknown_id = LENGTH_STRUCT.unpack(edited)[0]
-            if unknown_id:
-                temp_data['unknown_id'] = unknown_id
-            name_len_STRUCT = struct.Struct(">i")
-            cursor += 11
-            edited = payload[cursor:cursor + name_len_STRUCT.size]
-            name_len = name_len_STRUCT.unpack(edited)[0]
-            cursor += LENGTH_STRUCT.size
-            nick_name = bytes(payload[cursor:cursor + name_len]).decode("utf-8")
-            if nick_name:
-                temp_data['nick_name'] = nick_name
-            cursor += name_len
-
-            len_game_player_id = ord(payload[cursor:cursor + 1])
-            cursor += 1
-
-            game_player_id = int(payload[cursor:cursor + len_game_player_id])
-            if game_player_id:
-                temp_data['game_player_id'] = game_player_id
-            cursor += len_game_player_id
-
-            timestamp_start = LENGTH_STRUCT.unpack(payload[cursor:cursor + LENGTH_STRUCT.size])[0]
-            if timestamp_start:
-                temp_data['timestamp_start'] = timestamp_start
-            cursor += LENGTH_STRUCT.size + 33
-
-            gameParamsRev = payload[cursor:cursor + 16].decode("utf-8")
-            if gameParamsRev:
-                temp_data['gameParamsRev'] = gameParamsRev
-            cursor += 30
-
-            edited = payload[cursor:cursor + B_STRUCT.size]
-            battleLevel_index = B_STRUCT.unpack(edited)[0]
-            cursor += B_STRUCT.size
-            battleLevel = None
-            if battleLevel_index == 75:
-                edited = payload[cursor:cursor + C_STRUCT.size]
-                battleLevel = ord(C_STRUCT.unpack(edited)[0])
-                cursor += C_STRUCT.size
-            elif battleLevel_index == 74:
-                edited = payload[cursor:cursor + LENGTH_STRUCT.size]
-                battleLevel = LENGTH_STRUCT.unpack(edited)[0]
-                cursor += LENGTH_STRUCT.size
-            if battleLevel is not None:
-                temp_data['battleLevel'] = battleLevel
-            cursor += 13
-
-            edited = payload[cursor:cursor + B_STRUCT.size]
-            arenaTypeID_index = B_STRUCT.unpack(edited)[0]
-            cursor += B_STRUCT.size
-            arenaTypeID = None
-            if arenaTypeID_index == 75:
-                edited = payload[cursor:cursor + C_STRUCT.size]
-                arenaTypeID = ord(C_STRUCT.unpack(edited)[0])
-                cursor += C_STRUCT.size
-            elif arenaTypeID_index == 74:
-                edited = payload[cursor:cursor + LENGTH_STRUCT.size]
-                arenaTypeID = LENGTH_STRUCT.unpack(edited)[0]
-                cursor += LENGTH_STRUCT.size
-            if arenaTypeID is not None:
-                temp_data['arenaTypeID'] = arenaTypeID
-            cursor += 11
-
-            edited = payload[cursor:cursor + B_STRUCT.size]
-            arenaKind_index = B_STRUCT.unpack(edited)[0]
-            cursor += B_STRUCT.size
-            arenaKind = None
-            if arenaKind_index == 75:
-                edited = payload[cursor:cursor + C_STRUCT.size]
-                arenaKind = ord(C_STRUCT.unpack(edited)[0])
-                cursor += C_STRUCT.size
-            elif arenaKind_index == 74:
-                edited = payload[cursor:cursor + LENGTH_STRUCT.size]
-                arenaKind = LENGTH_STRUCT.unpack(edited)[0]
-                cursor += LENGTH_STRUCT.size
-            if arenaKind is not None:
-                temp_data['arenaKind'] = arenaKind
-        elif packet_type == 1:
-            cluster = payload[cursor:cursor + LENGTH_STRUCT.size]
-            world_id = LENGTH_STRUCT.unpack(cluster)[0]
-            if world_id:
-                temp_data['world_id'] = world_id
-            cursor = 14
-            cluster = payload[cursor:cursor + LENGTH_STRUCT.size]
-            entity_id = LENGTH_STRUCT.unpack(cluster)[0]
-            if entity_id:
-                temp_data['entity_id'] = entity_id
-            cursor += LENGTH_STRUCT.size
-            cluster = payload[cursor:cursor + CORD_STRUCT.size]
-            coordinate = CORD_STRUCT.unpack(cluster)
-            if coordinate:
-                temp_data['coordinate'] = coordinate
-        elif packet_type == 2:
-            cluster = payload[cursor:cursor + LENGTH_STRUCT.size]
-            world_id = LENGTH_STRUCT.unpack(cluster)[0]
-            if world_id:
-                temp_data['world_id'] = world_id
-        elif packet_type in [4, 7]:
-            cluster = payload[cursor:cursor + LENGTH_STRUCT.size]
-            entity_id = LENGTH_STRUCT.unpack(cluster)[0]
-            if entity_id:
-                temp_data['entity_id'] = entity_id
-        elif packet_type == 5:
-            cluster = payload[cursor:cursor + LENGTH_STRUCT.size]
-            entity_id = LENGTH_STRUCT.unpack(cluster)[0]
-            if entity_id:
-                temp_data['entity_id'] = entity_id
-            cursor += LENGTH_STRUCT.size
-
-            cluster = payload[cursor:cursor + LENGTH_STRUCT.size]
-            entity_type = LENGTH_STRUCT.unpack(cluster)[0]
-            if entity_type:
-                temp_data['entity_type'] = entity_type
-            cursor += LENGTH_STRUCT.size + 10
-
-            cluster = payload[cursor:cursor + CORD_STRUCT.size]
-            coordinate = CORD_STRUCT.unpack(cluster)
-            if coordinate:
-                temp_data['coordinate'] = coordinate
-
-            if entity_type == 6:
-                cursor = 61
-                cluster = payload[cursor:cursor + B_STRUCT.size]
-                type_byte = B_STRUCT.unpack(cluster)[0]
-                cursor += B_STRUCT.size
-                len_nickname = None
-                if type_byte == 12:
-                    cursor += 3
-                    cluster = payload[cursor:cursor + B_STRUCT.size]
-                    len_nickname = B_STRUCT.unpack(cluster)[0]
-                    cursor += B_STRUCT.size
-                elif type_byte == 20:
-                    cluster = payload[cursor:cursor + B_STRUCT.size]
-                    len_nickname = B_STRUCT.unpack(cluster)[0]
-                    cursor += B_STRUCT.size
-                if len_nickname:
-                    nick_name = payload[cursor:cursor + len_nickname]
-                    if nick_name:
-                        temp_data['nick_name'] = nick_name
-        elif packet_type == 6:
-            cluster = payload[cursor:cursor + LENGTH_STRUCT.size]
-            entity_id = LENGTH_STRUCT.unpack(cluster)[0]
-            if entity_id:
-                temp_data['entity_id'] = entity_id
-            cursor += LENGTH_STRUCT.size
-        elif packet_type == 35:
-            cluster = payload[cursor:cursor + LENGTH_STRUCT.size]
-            len_text = LENGTH_STRUCT.unpack(cluster)[0]
-            cursor += LENGTH_STRUCT.size
-            message_user = bytes(payload[cursor:cursor+len_text]).decode()
-            if message_user:
-                temp_data['message_user'] = message_user
-
+        temp_data = {'clock': CLOCK_STRUCT.unpack_from(payload)[0]}
+        decoder = PACKET_DECODERS.get(packet_type)
+        if decoder is not None:
+            decoder(payload, temp_data)
         return temp_data
 
     def get_map(self):
@@ -265,15 +846,13 @@ class ReplayWotParse(object):
             if 'mapDisplayName' in i:
                 return i['mapDisplayName']
 
+    def get_header_index(self):
+        if self.header_index is None:
+            self.header_index = HeaderIndex(self.data_head)
+        return self.header_index
+
     def get_player_team_id(self):
-        player_nick_name = None
-        for i in self.data_head:
-            if 'playerName' in i:
-                player_nick_name = i['playerName']
-            if 'vehicles' in i and player_nick_name:
-                for game_player_id in i['vehicles']:
-                    if 'name' in i['vehicles'][game_player_id] and  player_nick_name == i['vehicles'][game_player_id]['name']:
-                        return i['vehicles'][game_player_id]['team']
+        return self.get_header_index().player_team_id
 
     def get_time_stamp(self):
         for i in self.data_head:
@@ -281,81 +860,51 @@ class ReplayWotParse(object):
                 return int(datetime.datetime.strptime(i['dateTime'], "%d.%m.%Y %H:%M:%S").timestamp())
 
     def is_player_win(self):
-        player_team_id = self.get_player_team_id()
-        if not player_team_id: return None
-        for i in self.data_head:
-            if type(i) is list:
-                for j in i:
-                    if 'common' in j and 'winnerTeam' in j['common']:
-                        if player_team_id == j['common']['winnerTeam']:
-                            return True
-                        else:
-                            return False
+        header_index = self.get_header_index()
+        if not header_index.player_team_id: return None
+        if not header_index.has_winner_team: return None
+        return header_index.player_team_id == header_index.winner_team
+
+    def get_summary(self):
+        return {
+            'map': self.get_map(),
+            'time_stamp': self.get_time_stamp(),
+            'player_team_id': self.get_player_team_id(),
+            'player_win': self.is_player_win(),
+            'is_full_match': self.is_full_match,
+        }
 
     def get_player_info(self):
-        wg_player_id = None
-        player_name = None
-        for i in self.data_head:
-            if 'playerID' in i:
-                wg_player_id = i['playerID']
-            if 'playerName' in i:
-                player_name = i['playerName']
-
-        if not wg_player_id or not player_name: return None
-        player_data = {}
-        for i in self.data_head:
-            if type(i) is dict and 'vehicles' in i:
-                for game_player_id in i['vehicles']:
-                    if 'name' in i['vehicles'][game_player_id] and player_name == i['vehicles'][game_player_id]['name']:
-                        player_data['game_player_id'] = game_player_id
-                        player_data['info'] = i['vehicles'][game_player_id]
-            if type(i) is list and 'game_player_id' in player_data:
-                for j in i:
-                    if 'vehicles' in j and player_data['game_player_id'] in j['vehicles']:
-                        player_data['battle_info'] = j['vehicles'][player_data['game_player_id']]
-        return player_data
+        header_index = self.get_header_index()
+        if not header_index.player_id or not header_index.player_name: return None
+        if header_index.player_avatar_id is None: return {}
+        return header_index.get_player_info_by_avatar_id(header_index.player_avatar_id)
 
     def get_player_info_by_avatar_id(self, avatar_id):
-        user_data = {}
-        for i in self.data_head:
-            if type(i) is dict and 'vehicles' in i and avatar_id in i['vehicles']:
-                user_data['game_player_id'] = avatar_id
-                user_data['info'] = i['vehicles'][avatar_id]
-            if type(i) is list:
-                for j in i:
-                    if 'vehicles' in j and avatar_id in j['vehicles']:
-                        user_data['battle_info'] = j['vehicles'][avatar_id]
-        return user_data
+        return self.get_header_index().get_player_info_by_avatar_id(avatar_id)
+
+    def get_player_info_by_account_id(self, account_id):
+        header_index = self.get_header_index()
+        if account_id not in header_index.account_avatar: return {}
+        return header_index.get_player_info_by_avatar_id(header_index.account_avatar[account_id])
 
     def get_player_team_info(self):
-        player_team_id = self.get_player_team_id()
-        player_team_data = []
-        for i in self.data_head:
-            if type(i) is dict and 'vehicles' in i:
-                for game_player_id in i['vehicles']:
-                    if 'team' in i['vehicles'][game_player_id] and player_team_id == i['vehicles'][game_player_id]['team']:
-                        player_team_data.append(self.get_player_info_by_avatar_id(game_player_id))
-        return player_team_data
+        header_index = self.get_header_index()
+        return [header_index.get_player_info_by_avatar_id(avatar_id)
+                for avatar_id in header_index.team_members.get(header_index.player_team_id, [])]
 
     def get_player_enemy_info(self):
-        player_team_id = self.get_player_team_id()
-        player_enemy_data = []
-        for i in self.data_head:
-            if type(i) is dict and 'vehicles' in i:
-                for game_player_id in i['vehicles']:
-                    if 'team' in i['vehicles'][game_player_id] and player_team_id != i['vehicles'][game_player_id]['team']:
-                        player_enemy_data.append(self.get_player_info_by_avatar_id(game_player_id))
-        return player_enemy_data
-
-    def get_team_data_for_discord(self):
-        global all_tanks
-        from wot_statistic import get_all_tanks
+        header_index = self.get_header_index()
+        return [header_index.get_player_info_by_avatar_id(avatar_id)
+                for avatar_id, team in header_index.roster_order if team != header_index.player_team_id]
+
+    def get_team_data_for_discord(self, catalog=None):
         team_data = self.get_player_team_info()
         if not team_data: return
         return_data = {}
         win_or_lose = self.is_player_win()
-        if all_tanks is None:
-            all_tanks = get_all_tanks()
+        if catalog is None:
+            catalog = tank_catalog.get_tank_catalog()
         for i in team_data:
             player_wg_id = None
             reserve_tank_name = 'Unknown'
@@ -378,11 +927,7 @@ class ReplayWotParse(object):
                     if not 'vehicleType' in return_data[player_wg_id]:
                         return_data[player_wg_id]['vehicleType'] = []
                     if 'typeCompDescr' in tank_result:
-                        tank_name = reserve_tank_name
-                        if str(tank_result['typeCompDescr']) in all_tanks:
-                            data_tank = all_tanks[str(tank_result['typeCompDescr'])]
-                            if 'short_name' in data_tank:
-                                tank_name = data_tank['short_name']
+                        tank_name = catalog.get_short_name(int(tank_result['typeCompDescr']), reserve_tank_name)
                         if tank_name not in return_data[player_wg_id]['vehicleType']:
                             return_data[player_wg_id]['vehicleType'].append(tank_name)
                     if not 'frags' in return_data[player_wg_id]:
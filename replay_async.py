@@ -0,0 +1,71 @@
+import asyncio, concurrent.futures, weakref
+import full_replay_parser
+
+MAX_CONCURRENCY = 4
+default_parsers = weakref.WeakKeyDictionary()
+
+
+def parse_replay(source, only_head=True, decode=False, packet_types=None):
+    replay = full_replay_parser.ReplayWotParse(source, only_head)
+    if decode and not only_head:
+        replay.decode_gameplay(packet_types)
+    return replay
+
+
+def team_data_for_discord(replay, catalog=None):
+    return replay.get_team_data_for_discord(catalog)
+
+
+class AsyncReplayParser(object):
+    def __init__(self, executor=None, max_concurrency=MAX_CONCURRENCY):
+        # Jobs go straight to a concurrent.futures executor (a private thread pool by default) so
+        # a cancelled caller can drop its job while it is still queued.
+        self.executor = executor or concurrent.futures.ThreadPoolExecutor(max_concurrency)
+        self.limiter = asyncio.Semaphore(max_concurrency)
+
+    async def run(self, function, *args):
+        await self.limiter.acquire()
+        loop = asyncio.get_running_loop()
+        try:
+            job = self.executor.submit(function, *args)
+        except BaseException:
+            self.limiter.release()
+            raise
+        # The slot is held until the executor job itself finishes (or is dropped before it
+        # starts), not until the awaiting task goes away.
+        job.add_done_callback(lambda job: self.release_slot(loop))
+        try:
+            return await asyncio.wrap_future(job)
+        except asyncio.CancelledError:
+            job.cancel()
+            raise
+
+    def release_slot(self, loop):
+        try:
+            loop.call_soon_threadsafe(self.limiter.release)
+        except RuntimeError:
+            pass
+
+    async def parse(self, source, only_head=True, decode=False, packet_types=None):
+        if isinstance(self.executor, concurrent.futures.ProcessPoolExecutor) and \
+                isinstance(source, full_replay_parser.BUFFER_TYPES) and not isinstance(source, (bytes, bytearray)):
+            source = bytes(source)
+        return await self.run(parse_replay, source, only_head, decode, packet_types)
+
+    async def get_team_data_for_discord(self, replay, catalog=None):
+        return await self.run(team_data_for_discord, replay, catalog)
+
+
+def get_default_parser():
+    loop = asyncio.get_running_loop()
+    if loop not in default_parsers:
+        default_parsers[loop] = AsyncReplayParser()
+    return default_parsers[loop]
+
+
+async def parse_replay_async(source, only_head=True, decode=False, packet_types=None, parser=None):
+    return await (parser or get_default_parser()).parse(source, only_head, decode, packet_types)
+
+
+async def get_team_data_for_discord_async(replay, catalog=None, parser=None):
+    return await (parser or get_default_parser()).get_team_data_for_discord(replay, catalog)
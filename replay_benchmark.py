@@ -0,0 +1,99 @@
+import argparse, json, platform, sys, time, zlib
+import full_replay_parser
+import replay_generator
+
+SIZES = (1000, 10000, 100000)
+RESULTS_PATH = 'benchmark_results.json'
+
+
+def measure(function, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def benchmark_replay(packet_count, repeat=3, seed=0):
+    raw = replay_generator.build_replay(packet_count, seed=seed)
+    replay = full_replay_parser.ReplayWotParse(raw)
+    cursor = replay.gameplay_offset + 4
+    length = full_replay_parser.LENGTH_STRUCT.unpack_from(raw, cursor)[0]
+    encrypted = memoryview(raw)[cursor + 4:]
+    cipher = full_replay_parser.get_cipher()
+
+    stages = {}
+    elapsed, _ = measure(lambda: full_replay_parser.ReplayWotParse(raw), repeat)
+    stages['header'] = (elapsed, replay.gameplay_offset, 'bytes')
+    elapsed, decrypted = measure(lambda: cipher.decrypt_blocks(encrypted), repeat)
+    stages['decrypt'] = (elapsed, len(encrypted), 'bytes')
+    elapsed, chained = measure(lambda: full_replay_parser.xor_chain(decrypted), repeat)
+    stages['xor_chain'] = (elapsed, len(decrypted), 'bytes')
+    elapsed, _ = measure(lambda: zlib.decompress(memoryview(chained)[:length]), repeat)
+    stages['decompress'] = (elapsed, length, 'bytes')
+
+    replay = full_replay_parser.ReplayWotParse(raw, False)
+    packets = [(packet_type, payload) for offset, packet_type, payload_length, payload in replay.iter_packets()]
+    elapsed, _ = measure(lambda: [replay.decode_packet(payload, packet_type) for packet_type, payload in packets], repeat)
+    stages['decode_packet'] = (elapsed, len(packets), 'packets')
+    elapsed, _ = measure(replay.decode_gameplay, repeat)
+    stages['decode'] = (elapsed, len(replay.get_packet_index()['offset']), 'packets')
+    for packet_type in sorted(replay.get_packet_index()['by_type']):
+        elapsed, _ = measure(lambda: replay.decode_gameplay([packet_type]), repeat)
+        stages['decode_type_%s' % packet_type] = (
+            elapsed, len(replay.get_packet_index()['by_type'][packet_type]), 'packets')
+
+    return {
+        stage: {'seconds': elapsed, 'unit': unit, 'count': count, 'per_second': count / elapsed if elapsed else None}
+        for stage, (elapsed, count, unit) in stages.items()
+    }
+
+
+def run(sizes=SIZES, repeat=3, seed=0):
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'numpy': full_replay_parser.blowfish_mod.load_numpy() is not None,
+        'results': {str(packet_count): benchmark_replay(packet_count, repeat, seed) for packet_count in sizes},
+    }
+
+
+def compare(current, previous):
+    lines = []
+    for size, stages in current['results'].items():
+        for stage, result in stages.items():
+            old = previous.get('results', {}).get(size, {}).get(stage)
+            if not old or not old['seconds']: continue
+            lines.append('%8s %-16s %10.6fs -> %10.6fs  x%.2f' % (
+                size, stage, old['seconds'], result['seconds'], old['seconds'] / result['seconds']))
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark every replay parsing stage on synthetic replays.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES), help='packet counts per replay')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', default=RESULTS_PATH)
+    parser.add_argument('--compare', help='previous results file to compare against')
+    args = parser.parse_args(argv)
+
+    current = run(args.sizes, args.repeat, args.seed)
+    for size, stages in current['results'].items():
+        for stage, result in stages.items():
+            sys.stdout.write('%8s %-16s %10.6fs %14.0f %s/s\n' % (
+                size, stage, result['seconds'], result['per_second'] or 0, result['unit']))
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as previous_file:
+            for line in compare(current, json.load(previous_file)):
+                sys.stdout.write(line + '\n')
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(current, output_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
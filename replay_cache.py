@@ -0,0 +1,151 @@
+import hashlib, json, mmap, os, pathlib, sqlite3, time
+import full_replay_parser
+
+HEAD_HASH_BYTES = 64 * 1024
+FLUSH_EVERY = 1024
+
+
+class MetadataCache(object):
+    def __init__(self, db_path, max_entries=100000, hash_bytes=HEAD_HASH_BYTES, flush_every=FLUSH_EVERY):
+        self.max_entries = max_entries
+        self.hash_bytes = hash_bytes
+        self.flush_every = flush_every
+        self.pending_access = {}
+        self.pending_writes = 0
+        self.connection = sqlite3.connect(str(db_path))
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS replay_meta ('
+            'path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, head_hash TEXT, '
+            'data_head TEXT, summary TEXT, last_access REAL)')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS replay_meta_access ON replay_meta (last_access)')
+        self.connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.flush()
+        self.connection.close()
+
+    def flush(self):
+        if self.pending_access:
+            self.connection.executemany('UPDATE replay_meta SET last_access = ? WHERE path = ?',
+                                        [(last_access, path) for path, last_access in self.pending_access.items()])
+            self.pending_access.clear()
+        if self.pending_writes:
+            self.evict()
+            self.pending_writes = 0
+        self.connection.commit()
+
+    def replay_key(self, replay_path):
+        replay_path = pathlib.Path(replay_path).resolve()
+        stat = os.stat(replay_path)
+        with open(replay_path, 'rb') as replay:
+            head_hash = hashlib.blake2b(replay.read(self.hash_bytes), digest_size=16).hexdigest()
+        return str(replay_path), stat.st_size, stat.st_mtime_ns, head_hash
+
+    def lookup(self, replay_path, columns):
+        path, size, mtime_ns, head_hash = key = self.replay_key(replay_path)
+        row = self.connection.execute(
+            'SELECT size, mtime_ns, head_hash, %s FROM replay_meta WHERE path = ?' % ', '.join(columns),
+            (path,)).fetchone()
+        if row and tuple(row[:3]) == (size, mtime_ns, head_hash):
+            self.pending_access[path] = time.time()
+            if len(self.pending_access) >= self.flush_every:
+                self.flush()
+            return {column: json.loads(value) for column, value in zip(columns, row[3:])}
+        return self.store(key)
+
+    def store(self, key):
+        path, size, mtime_ns, head_hash = key
+        replay = full_replay_parser.ReplayWotParse(path)
+        entry = {'data_head': replay.data_head, 'summary': replay.get_summary()}
+        self.connection.execute(
+            'INSERT OR REPLACE INTO replay_meta VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (path, size, mtime_ns, head_hash, json.dumps(entry['data_head']), json.dumps(entry['summary']),
+             time.time()))
+        self.pending_access.pop(path, None)
+        self.pending_writes += 1
+        if self.pending_writes >= self.flush_every:
+            self.flush()
+        return entry
+
+    def get(self, replay_path):
+        return self.lookup(replay_path, ('data_head', 'summary'))
+
+    def get_summary(self, replay_path):
+        return self.lookup(replay_path, ('summary',))['summary']
+
+    def load(self, replay_path):
+        return full_replay_parser.ReplayWotParse.from_head(self.get(replay_path)['data_head'], replay_path)
+
+    def evict(self):
+        self.connection.execute(
+            'DELETE FROM replay_meta WHERE path IN '
+            '(SELECT path FROM replay_meta ORDER BY last_access DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,))
+
+
+class GameplayCache(object):
+    def __init__(self, directory, max_bytes=2 << 30):
+        self.directory = pathlib.Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def key(self, *encrypted_parts):
+        digest = hashlib.blake2b(digest_size=20)
+        for part in encrypted_parts:
+            digest.update(part)
+        return digest.hexdigest()
+
+    def path(self, key):
+        return self.directory / (key + '.gameplay')
+
+    def load(self, key):
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as cached:
+                data = mmap.mmap(cached.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def store(self, key, data):
+        if not data: return
+        path = self.path(key)
+        temp_path = path.with_name('%s.%s.tmp' % (path.name, os.getpid()))
+        try:
+            with open(temp_path, 'wb') as cached:
+                cached.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            try:
+                temp_path.unlink()
+            except OSError:
+                pass
+            return
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for path in self.directory.glob('*.gameplay'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for mtime, size, path in entries)
+        for mtime, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes: break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
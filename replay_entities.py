@@ -0,0 +1,123 @@
+import bisect, math
+import full_replay_parser
+
+SPAWN_PACKET = 5
+LEAVE_PACKET = 6
+ENTER_AOI_PACKET = 4
+LEAVE_AOI_PACKET = 7
+POSITION_PACKET = 1
+LIFECYCLE_PACKETS = {SPAWN_PACKET, LEAVE_PACKET, ENTER_AOI_PACKET, LEAVE_AOI_PACKET, POSITION_PACKET}
+
+
+class EntityRecord(object):
+    __slots__ = ('entity_id', 'entity_type', 'nick_name', 'spawn_clock', 'last_seen', 'intervals', 'player')
+
+    def __init__(self, entity_id):
+        self.entity_id = entity_id
+        self.entity_type = None
+        self.nick_name = None
+        self.spawn_clock = None
+        self.last_seen = None
+        self.intervals = []
+        self.player = {}
+
+    def is_open(self):
+        return bool(self.intervals) and self.intervals[-1][1] == math.inf
+
+    def open(self, clock):
+        if not self.is_open():
+            self.intervals.append([clock, math.inf])
+
+    def close(self, clock):
+        if self.is_open():
+            self.intervals[-1][1] = clock
+
+    def is_active(self, clock):
+        position = bisect.bisect_right(self.intervals, [clock, math.inf]) - 1
+        if position < 0: return False
+        start, end = self.intervals[position]
+        return start <= clock and (clock < end or end == math.inf)
+
+    def __repr__(self):
+        return 'EntityRecord(entity_id=%s, entity_type=%s, nick_name=%r, spawn_clock=%s, intervals=%s)' % (
+            self.entity_id, self.entity_type, self.nick_name, self.spawn_clock, len(self.intervals))
+
+
+class EntityIndex(object):
+    def __init__(self, replay):
+        self.entities = {}
+        for offset, packet_type, payload_length, payload in replay.iter_packets(LIFECYCLE_PACKETS):
+            if len(payload) < full_replay_parser.ENTITY_ID_FIELD[packet_type] + 4: continue
+            clock = full_replay_parser.CLOCK_STRUCT.unpack_from(payload)[0]
+            entity_id = full_replay_parser.LENGTH_STRUCT.unpack_from(payload, full_replay_parser.ENTITY_ID_FIELD[packet_type])[0]
+            if not entity_id: continue
+            entity = self.entities.get(entity_id)
+            if entity is None:
+                entity = self.entities[entity_id] = EntityRecord(entity_id)
+            entity.last_seen = clock
+            if packet_type == SPAWN_PACKET:
+                packet_data = replay.decode_packet(payload, packet_type, payload_length)
+                if entity.spawn_clock is None:
+                    entity.spawn_clock = clock
+                entity.entity_type = packet_data.get('entity_type', entity.entity_type)
+                if 'nick_name' in packet_data:
+                    entity.nick_name = packet_data['nick_name'].decode('utf-8', 'replace')
+                entity.open(clock)
+            elif packet_type in (LEAVE_PACKET, LEAVE_AOI_PACKET):
+                entity.close(clock)
+            else:
+                entity.open(clock)
+
+        for entity_id, entity in self.entities.items():
+            entity.player = replay.get_player_info_by_avatar_id(str(entity_id))
+        self.build_snapshots()
+
+    def build_snapshots(self):
+        changes = []
+        for entity_id, entity in self.entities.items():
+            for start, end in entity.intervals:
+                changes.append((start, 1, entity_id))
+                if end != math.inf:
+                    changes.append((end, 0, entity_id))
+        changes.sort()
+        self.change_clocks = []
+        self.snapshots = []
+        active = set()
+        for clock, is_start, entity_id in changes:
+            if is_start:
+                active.add(entity_id)
+            else:
+                active.discard(entity_id)
+            if self.change_clocks and self.change_clocks[-1] == clock:
+                self.snapshots[-1] = frozenset(active)
+            else:
+                self.change_clocks.append(clock)
+                self.snapshots.append(frozenset(active))
+
+    def active_at(self, clock):
+        position = bisect.bisect_right(self.change_clocks, clock) - 1
+        if position < 0: return frozenset()
+        return self.snapshots[position]
+
+    def active_between(self, start_clock, end_clock):
+        first = max(bisect.bisect_right(self.change_clocks, start_clock) - 1, 0)
+        last = bisect.bisect_right(self.change_clocks, end_clock)
+        active = set()
+        for snapshot in self.snapshots[first:last]:
+            active.update(snapshot)
+        return frozenset(active)
+
+    def is_active(self, entity_id, clock):
+        entity = self.entities.get(entity_id)
+        return entity is not None and entity.is_active(clock)
+
+    def get(self, entity_id):
+        return self.entities.get(entity_id)
+
+    def by_nick_name(self, nick_name):
+        return [entity for entity in self.entities.values()
+                if entity.nick_name == nick_name or entity.player.get('info', {}).get('name') == nick_name]
+
+
+def build_entity_index(replay):
+    return EntityIndex(replay)
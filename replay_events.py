@@ -0,0 +1,94 @@
+import re, struct
+from array import array
+import blowfish_mod
+import full_replay_parser
+
+ENTITY_METHOD_PACKET = 8
+# No default: type 7 is leave-AoI (full_replay_parser, replay_entities), so callers name the type.
+ENTITY_PROPERTY_PACKET = None
+EVENT_HEADER_STRUCT = struct.Struct("<iii")
+EVENT_ARGS_OFFSET = full_replay_parser.CLOCK_STRUCT.size + EVENT_HEADER_STRUCT.size
+EVENT_LAYOUTS = {}
+EVENT_FORMAT_CODE = re.compile(r'(\d*)(\D)')
+ARRAY_TYPECODES = 'bBhHiIlLqQfd'
+
+
+def register_event_layout(kind, fmt, fields):
+    layout = struct.Struct(fmt)
+    typecodes = []
+    for count, code in EVENT_FORMAT_CODE.findall(fmt.lstrip('<>=!@').replace(' ', '')):
+        if code == 'x': continue
+        if code not in ARRAY_TYPECODES:
+            raise RuntimeError("Event layout %s uses %r, which has no array typecode" % (kind, code))
+        typecodes.extend(code * int(count or 1))
+    if len(typecodes) != len(fields) or len(layout.unpack(bytes(layout.size))) != len(fields):
+        raise RuntimeError("Event layout %s has %s values but %s field names" % (kind, len(typecodes), len(fields)))
+    EVENT_LAYOUTS[kind] = (layout, tuple(fields), tuple(typecodes))
+
+
+register_event_layout('damage', '<hiB', ('new_health', 'attacker_id', 'attack_reason_id'))
+register_event_layout('shot', '<B', ('burst_count',))
+register_event_layout('health', '<h', ('health',))
+
+
+class EventColumns(object):
+    def __init__(self, kind):
+        layout, fields, typecodes = EVENT_LAYOUTS[kind]
+        self.kind = kind
+        self.layout = layout
+        self.fields = fields
+        self.columns = {'clock': array('f'), 'entity_id': array('i')}
+        for field, typecode in zip(fields, typecodes):
+            self.columns[field] = array(typecode)
+
+    def __len__(self):
+        return len(self.columns['clock'])
+
+    def append(self, clock, entity_id, values):
+        columns = self.columns
+        columns['clock'].append(clock)
+        columns['entity_id'].append(entity_id)
+        for field, value in zip(self.fields, values):
+            columns[field].append(value)
+
+    def rows(self):
+        names = list(self.columns)
+        for values in zip(*self.columns.values()):
+            yield dict(zip(names, values))
+
+    def to_numpy(self):
+        numpy = blowfish_mod.load_numpy()
+        if numpy is None:
+            raise ImportError("numpy is required to convert event columns")
+        return {name: numpy.array(column) for name, column in self.columns.items()}
+
+
+def decode_entity_events(replay, methods=None, properties=None,
+                         method_packet_type=ENTITY_METHOD_PACKET, property_packet_type=ENTITY_PROPERTY_PACKET):
+    kinds = {}
+    for message_map in (methods or {}, properties or {}):
+        for kind in message_map.values():
+            if kind not in kinds:
+                kinds[kind] = EventColumns(kind)
+    routes = {}
+    if methods:
+        routes[method_packet_type] = methods
+    if properties:
+        if property_packet_type is None:
+            raise RuntimeError("property_packet_type is required to decode entity property updates")
+        if property_packet_type in routes:
+            raise RuntimeError("Method and property updates cannot share packet type %s" % property_packet_type)
+        routes[property_packet_type] = properties
+    if not routes:
+        return kinds
+
+    for offset, packet_type, payload_length, payload in replay.iter_packets(set(routes)):
+        if len(payload) < EVENT_ARGS_OFFSET: continue
+        entity_id, message_id, args_length = EVENT_HEADER_STRUCT.unpack_from(payload, full_replay_parser.CLOCK_STRUCT.size)
+        kind = routes[packet_type].get(message_id)
+        if kind is None: continue
+        events = kinds[kind]
+        if args_length < events.layout.size or len(payload) < EVENT_ARGS_OFFSET + events.layout.size: continue
+        events.append(full_replay_parser.CLOCK_STRUCT.unpack_from(payload)[0], entity_id,
+                      events.layout.unpack_from(payload, EVENT_ARGS_OFFSET))
+    return kinds
@@ -0,0 +1,249 @@
+import argparse, json, pathlib, sys, zipfile
+import blowfish_mod
+import batch_parser
+import full_replay_parser
+
+EXPORT_ROW_GROUP_SIZE = 1 << 16
+EXPORT_TABLES = ('replays', 'packets', 'tracks', 'roster')
+EXPORT_FORMATS = ('parquet', 'npz')
+pyarrow = False
+
+
+def load_pyarrow():
+    global pyarrow
+    if pyarrow is False:
+        try:
+            import pyarrow.parquet
+        except ImportError:
+            pyarrow = None
+    return pyarrow
+
+
+def require_numpy():
+    numpy = blowfish_mod.load_numpy()
+    if numpy is None:
+        raise ImportError("numpy is required to export replays to columnar files")
+    return numpy
+
+
+def optional_int(value):
+    return -1 if value is None else int(value)
+
+
+class ParquetTableWriter(object):
+    suffix = '.parquet'
+
+    def __init__(self, table_path):
+        self.table_path = table_path
+        self.writer = None
+
+    def write(self, columns):
+        table = pyarrow.table(columns)
+        if self.writer is None:
+            self.writer = pyarrow.parquet.ParquetWriter(str(self.table_path), table.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class NpzTableWriter(object):
+    suffix = '.npz'
+
+    def __init__(self, table_path):
+        self.table_path = table_path
+        self.archive = None
+        self.chunk_count = 0
+
+    def write(self, columns):
+        numpy = require_numpy()
+        if self.archive is None:
+            self.archive = zipfile.ZipFile(str(self.table_path), 'w', zipfile.ZIP_STORED, allowZip64=True)
+        for name, column in columns.items():
+            with self.archive.open('%s/%08d.npy' % (name, self.chunk_count), 'w', force_zip64=True) as member:
+                numpy.lib.format.write_array(member, numpy.ascontiguousarray(column), allow_pickle=False)
+        self.chunk_count += 1
+
+    def close(self):
+        if self.archive is not None:
+            self.archive.close()
+            self.archive = None
+
+
+TABLE_WRITERS = {'parquet': ParquetTableWriter, 'npz': NpzTableWriter}
+
+
+def replay_columns(replay, replay_id):
+    numpy = require_numpy()
+    header_index = replay.get_header_index()
+    return {
+        'replay_id': numpy.array([replay_id], dtype='<i4'),
+        'path': numpy.array([str(replay.replay_path or '')]),
+        'map': numpy.array([replay.get_map() or '']),
+        'time_stamp': numpy.array([optional_int(replay.get_time_stamp())], dtype='<i8'),
+        'player_id': numpy.array([optional_int(header_index.player_id)], dtype='<i8'),
+        'player_name': numpy.array([header_index.player_name or '']),
+        'player_team_id': numpy.array([optional_int(header_index.player_team_id)], dtype='<i2'),
+        'player_win': numpy.array([optional_int(replay.is_player_win())], dtype='<i1'),
+        'packet_count': numpy.array([len(replay.get_packet_index()['offset']) if replay.data_gameplay else 0],
+                                    dtype='<i8'),
+    }
+
+
+def packet_columns(replay, replay_id, packet_types=None):
+    numpy = require_numpy()
+    if not replay.data_gameplay: return None
+    table = replay.packet_table(packet_types)
+    columns = {'replay_id': numpy.full(len(table), replay_id, dtype='<i4')}
+    columns.update((field, table[field]) for field in table.dtype.names)
+    return columns
+
+
+def track_columns(replay, replay_id, packet_types=(1, 5)):
+    numpy = require_numpy()
+    if not replay.data_gameplay: return None
+    tracks = replay.extract_tracks(packet_types)
+    if not tracks: return None
+    columns = {
+        'replay_id': numpy.full(sum(len(track['clock']) for track in tracks.values()), replay_id, dtype='<i4'),
+        'entity_id': numpy.concatenate([numpy.full(len(track['clock']), entity_id, dtype='<i4')
+                                        for entity_id, track in tracks.items()]),
+    }
+    for field in ('clock', 'x', 'y', 'z'):
+        columns[field] = numpy.concatenate([track[field] for track in tracks.values()])
+    return columns
+
+
+def roster_columns(replay, replay_id):
+    numpy = require_numpy()
+    header_index = replay.get_header_index()
+    rows = []
+    for avatar_id, vehicle in header_index.roster.items():
+        result = (header_index.battle_results.get(avatar_id) or [{}])[0]
+        rows.append((int(avatar_id), optional_int(result.get('accountDBID')), vehicle.get('name', ''),
+                     optional_int(vehicle.get('team')), vehicle.get('vehicleType', ''),
+                     optional_int(result.get('typeCompDescr')), optional_int(result.get('kills')),
+                     optional_int(result.get('damageDealt'))))
+    if not rows: return None
+    avatar_ids, account_ids, names, teams, vehicle_types, tank_ids, kills, damage_dealt = zip(*rows)
+    return {
+        'replay_id': numpy.full(len(rows), replay_id, dtype='<i4'),
+        'avatar_id': numpy.array(avatar_ids, dtype='<i8'),
+        'account_id': numpy.array(account_ids, dtype='<i8'),
+        'name': numpy.array(names, dtype=str),
+        'team': numpy.array(teams, dtype='<i2'),
+        'vehicle_type': numpy.array(vehicle_types, dtype=str),
+        'tank_id': numpy.array(tank_ids, dtype='<i8'),
+        'kills': numpy.array(kills, dtype='<i4'),
+        'damage_dealt': numpy.array(damage_dealt, dtype='<i4'),
+    }
+
+
+class ColumnarExporter(object):
+    def __init__(self, output_dir, export_format=None, row_group_size=EXPORT_ROW_GROUP_SIZE, packet_types=None):
+        require_numpy()
+        if export_format is None:
+            export_format = 'parquet' if load_pyarrow() is not None else 'npz'
+        if export_format not in TABLE_WRITERS:
+            raise ValueError("Unknown export format %r, expected one of %s" % (export_format, EXPORT_FORMATS))
+        if export_format == 'parquet' and load_pyarrow() is None:
+            raise ImportError("pyarrow is required to export replays to parquet")
+        self.output_dir = pathlib.Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.export_format = export_format
+        self.row_group_size = row_group_size
+        self.packet_types = packet_types
+        self.replay_count = 0
+        writer_class = TABLE_WRITERS[export_format]
+        self.writers = {name: writer_class(self.output_dir / (name + writer_class.suffix)) for name in EXPORT_TABLES}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, name, columns):
+        if not columns: return
+        row_count = len(next(iter(columns.values())))
+        for start in range(0, row_count, self.row_group_size):
+            self.writers[name].write({field: column[start:start + self.row_group_size]
+                                      for field, column in columns.items()})
+
+    def add_replay(self, replay):
+        replay_id = self.replay_count
+        tables = {
+            'replays': replay_columns(replay, replay_id),
+            'packets': packet_columns(replay, replay_id, self.packet_types),
+            'tracks': track_columns(replay, replay_id),
+            'roster': roster_columns(replay, replay_id),
+        }
+        for name in EXPORT_TABLES:
+            self.write(name, tables[name])
+        self.replay_count += 1
+        return replay_id
+
+    def table_paths(self):
+        return {name: writer.table_path for name, writer in self.writers.items() if writer.table_path.exists()}
+
+    def close(self):
+        for writer in self.writers.values():
+            writer.close()
+
+
+def export_replays(replay_paths, output_dir, export_format=None, row_group_size=EXPORT_ROW_GROUP_SIZE,
+                   packet_types=None):
+    results = []
+    with ColumnarExporter(output_dir, export_format, row_group_size, packet_types) as exporter:
+        for replay_path in replay_paths:
+            result = {'path': str(replay_path), 'error': None}
+            try:
+                if not pathlib.Path(replay_path).is_file():
+                    raise FileNotFoundError(replay_path)
+                replay = full_replay_parser.ReplayWotParse(replay_path, False)
+                result['replay_id'] = exporter.add_replay(replay)
+            except Exception as error:
+                result['error'] = '%s: %s' % (type(error).__name__, error)
+            results.append(result)
+    return results
+
+
+def load_table(table_path):
+    numpy = require_numpy()
+    table_path = pathlib.Path(table_path)
+    if table_path.suffix == '.parquet':
+        if load_pyarrow() is None:
+            raise ImportError("pyarrow is required to read parquet exports")
+        table = pyarrow.parquet.read_table(str(table_path))
+        return {name: table.column(name).to_numpy() for name in table.column_names}
+    chunks = {}
+    with zipfile.ZipFile(str(table_path)) as archive:
+        for member in archive.namelist():
+            name = member.rsplit('/', 1)[0]
+            with archive.open(member) as member_file:
+                chunks.setdefault(name, []).append(numpy.lib.format.read_array(member_file, allow_pickle=False))
+    return {name: numpy.concatenate(arrays) for name, arrays in chunks.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export World of Tanks replays to columnar files.')
+    parser.add_argument('paths', nargs='+', help='replay files or directories to scan for *.wotreplay')
+    parser.add_argument('-o', '--output', required=True, help='directory for the exported tables')
+    parser.add_argument('--format', choices=EXPORT_FORMATS, default=None,
+                        help='parquet when pyarrow is installed, npz otherwise')
+    parser.add_argument('--row-group-size', type=int, default=EXPORT_ROW_GROUP_SIZE)
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for result in export_replays(batch_parser.find_replays(args.paths), args.output, args.format,
+                                 args.row_group_size):
+        if result['error']:
+            failed += 1
+        sys.stdout.write(json.dumps(result) + '\n')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,162 @@
+import argparse, datetime, json, random, struct, sys, zlib
+import blowfish_mod
+import full_replay_parser
+
+REPLAY_MAGIC = b"\x12\x32\x34\x11"
+FIRST_AVATAR_ID = 10000000
+FIRST_ACCOUNT_ID = 500000000
+
+
+def build_head_blocks(vehicle_count=30, seed=0, player_index=0):
+    generator = random.Random(seed)
+    avatar_ids = [str(FIRST_AVATAR_ID + i) for i in range(vehicle_count)]
+    vehicles = {}
+    results = {}
+    for i, avatar_id in enumerate(avatar_ids):
+        vehicles[avatar_id] = {
+            'name': 'player_%s' % i,
+            'team': 1 + i % 2,
+            'vehicleType': 'ussr:R%03d_Synthetic' % i,
+            'isAlive': generator.random() < 0.5,
+            'isTeamKiller': False,
+        }
+        results[avatar_id] = [{
+            'typeCompDescr': 1 + i * 256,
+            'accountDBID': FIRST_ACCOUNT_ID + i,
+            'kills': generator.randrange(4),
+            'shots': generator.randrange(10, 30),
+            'directHits': generator.randrange(10),
+            'piercingEnemyHits': generator.randrange(8),
+            'damageDealt': generator.randrange(4000),
+            'damageAssistedRadio': generator.randrange(1000),
+            'damageAssistedTrack': generator.randrange(500),
+            'damageBlockedByArmor': generator.randrange(2000),
+        }]
+    player_name = vehicles[avatar_ids[player_index]]['name']
+    return [
+        {
+            'playerName': player_name,
+            'playerID': FIRST_ACCOUNT_ID + player_index,
+            'playerVehicle': vehicles[avatar_ids[player_index]]['vehicleType'],
+            'mapName': '04_himmelsdorf',
+            'mapDisplayName': 'Himmelsdorf',
+            'dateTime': datetime.datetime(2021, 10, 29, 9, 54).strftime("%d.%m.%Y %H:%M:%S"),
+            'vehicles': vehicles,
+        },
+        [{'common': {'winnerTeam': 1 + generator.randrange(2), 'duration': 420}, 'vehicles': results}],
+    ]
+
+
+def pack_packet(packet_type, clock, body):
+    return full_replay_parser.PACKET_HEADER_STRUCT.pack(len(body), packet_type) + \
+        full_replay_parser.CLOCK_STRUCT.pack(clock) + body
+
+
+def battle_setup_body(player_name, account_id, battle_level=10, arena_type_id=1234, arena_kind=1):
+    name = player_name.encode("utf-8")
+    account = str(account_id).encode("ascii")
+    return b"".join([
+        struct.pack("<i", 1), bytes(7),
+        struct.pack(">i", len(name)), name,
+        bytes([len(account)]), account,
+        struct.pack("<i", 1635490440), bytes(33),
+        b"1.14.1.0_synthet", bytes(14),
+        bytes([75, battle_level]), bytes(13),
+        bytes([74]), struct.pack("<i", arena_type_id), bytes(11),
+        bytes([75, arena_kind]), bytes(4),
+    ])
+
+
+def position_body(entity_id, coordinate):
+    return struct.pack("<i", 1) + bytes(6) + struct.pack("<i", entity_id) + \
+        full_replay_parser.CORD_STRUCT.pack(*coordinate)
+
+
+def entity_create_body(entity_id, coordinate, nick_name):
+    nick_name = nick_name.encode("utf-8")
+    body = struct.pack("<ii", entity_id, 6) + bytes(10) + full_replay_parser.CORD_STRUCT.pack(*coordinate)
+    body += bytes(57 - len(body))
+    return body + bytes([20, len(nick_name)]) + nick_name
+
+
+def chat_body(message):
+    message = message.encode("utf-8")
+    return struct.pack("<i", len(message)) + message
+
+
+def build_packets(data_head, packet_count=10000, seed=0):
+    generator = random.Random(seed)
+    vehicles = data_head[0]['vehicles']
+    avatar_ids = [int(avatar_id) for avatar_id in vehicles]
+    positions = {avatar_id: [generator.uniform(-500, 500), generator.uniform(0, 50), generator.uniform(-500, 500)]
+                 for avatar_id in avatar_ids}
+    packets = [pack_packet(0, 0.0, battle_setup_body(data_head[0]['playerName'], data_head[0]['playerID']))]
+    for avatar_id in avatar_ids:
+        packets.append(pack_packet(5, 0.0, entity_create_body(avatar_id, positions[avatar_id],
+                                                              vehicles[str(avatar_id)]['name'])))
+    clock = 0.0
+    for i in range(max(packet_count - len(packets), 0)):
+        clock += generator.random() * 0.05
+        if generator.random() < 0.01:
+            packets.append(pack_packet(35, clock, chat_body('synthetic message %s' % i)))
+            continue
+        avatar_id = generator.choice(avatar_ids)
+        coordinate = positions[avatar_id]
+        coordinate[0] += generator.uniform(-1, 1)
+        coordinate[2] += generator.uniform(-1, 1)
+        packets.append(pack_packet(1, clock, position_body(avatar_id, coordinate)))
+    return b"".join(packets)
+
+
+def encrypt_gameplay(compressed, cipher=None):
+    cipher = cipher or full_replay_parser.get_cipher()
+    padded = compressed + bytes(-len(compressed) % full_replay_parser.BLOCK_LENGTH)
+    numpy = blowfish_mod.load_numpy()
+    if numpy is not None:
+        plain = numpy.frombuffer(padded, dtype=numpy.uint64)
+        feedback = plain.copy()
+        feedback[1:] ^= plain[:-1]
+        return cipher.encrypt_blocks(feedback.tobytes())
+    feedback = bytearray(padded)
+    for cursor in range(full_replay_parser.BLOCK_LENGTH, len(padded)):
+        feedback[cursor] ^= padded[cursor - full_replay_parser.BLOCK_LENGTH]
+    return cipher.encrypt_blocks(bytes(feedback))
+
+
+def build_replay(packet_count=10000, vehicle_count=30, seed=0, data_head=None, gameplay=None):
+    data_head = data_head or build_head_blocks(vehicle_count, seed)
+    if gameplay is None:
+        gameplay = build_packets(data_head, packet_count, seed)
+    compressed = zlib.compress(gameplay)
+    blocks = [json.dumps(block).encode("utf-8") for block in data_head]
+    parts = [REPLAY_MAGIC, full_replay_parser.LENGTH_STRUCT.pack(len(blocks))]
+    for block in blocks:
+        parts += [full_replay_parser.LENGTH_STRUCT.pack(len(block)), block]
+    parts += [
+        full_replay_parser.LENGTH_STRUCT.pack(len(gameplay)),
+        full_replay_parser.LENGTH_STRUCT.pack(len(compressed)),
+        encrypt_gameplay(compressed),
+    ]
+    return b"".join(parts)
+
+
+def write_replay(replay_path, packet_count=10000, vehicle_count=30, seed=0):
+    replay = build_replay(packet_count, vehicle_count, seed)
+    with open(replay_path, 'wb') as replay_file:
+        replay_file.write(replay)
+    return len(replay)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write a synthetic .wotreplay file.')
+    parser.add_argument('path')
+    parser.add_argument('-n', '--packets', type=int, default=10000)
+    parser.add_argument('--vehicles', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    size = write_replay(args.path, args.packets, args.vehicles, args.seed)
+    sys.stdout.write('%s: %s bytes\n' % (args.path, size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,266 @@
+from array import array
+
+# Blowfish P-array followed by the four S-boxes, expanded from full_replay_parser.REPLAY_KEY.
+REPLAY_KEY_SCHEDULE = array('I', [
+    0xFCF7A2E3, 0xE5CDC24B, 0x84775092, 0x158C7B49,
+    0xE39E6687, 0xC2D6E47D, 0xD15A500B, 0xADFFF578,
+    0x0264724C, 0x4B5EFBC9, 0xA0AE1E52, 0x99600CE9,
+    0xB02F3687, 0xE5AB6C3F, 0x77E72EAF, 0x34A3E9E3,
+    0xF6D228F3, 0x2DE4558F, 0xDE6D2CCB, 0x51F2D96A,
+    0xBFBE52CC, 0xDC052FBC, 0x173E4878, 0x88059ED7,
+    0x685DCDB5, 0xB66F964B, 0xF4D27A79, 0x2194A8C0,
+    0xC328F5D6, 0x67212004, 0xFD765069, 0x22067FFB,
+    0x427E3617, 0xAE840CF5, 0x62CEEE6F, 0xC0937AC0,
+    0x595BA81A, 0x26F298C1, 0xD72B88F9, 0x6328E3F2,
+    0x5703E1B8, 0x8205955D, 0x7AC26FBB, 0x55336539,
+    0xD898DD14, 0x09C481F0, 0xACEDB9DE, 0x1373F327,
+    0xB32456C9, 0xC9757C90, 0xE2DB91DA, 0x7D8638EA,
+    0x2A9971EF, 0x49A926EE, 0x6EDE0BCA, 0x462F1617,
+    0xC331AE1F, 0xF6D1B750, 0x4B90D898, 0x6FD9B588,
+    0x41219D79, 0x96AFC66C, 0xBFEE84F0, 0x40208C34,
+    0x93D18C54, 0x243173B3, 0x6C331AE4, 0xEAFE4A1A,
+    0x036C47F8, 0x350CD33A, 0x1932ACAD, 0x906D8D4C,
+    0x6F33D51B, 0x2A8D920C, 0xD28AB008, 0xFFB07856,
+    0x61192D34, 0xFA07C1F9, 0xE0E2FBE9, 0x43DDF3DE,
+    0xF0557FAA, 0x3024EB8B, 0xBC6A5D0B, 0x7B10EFE4,
+    0x34F4E34B, 0x600BD669, 0x814765ED, 0x085FBF1D,
+    0x148D49B6, 0x56504CA4, 0x6E9298C9, 0xFC5654DB,
+    0x243D2FE0, 0xA4199601, 0x18E3C736, 0x44C3E3CE,
+    0x1F0B3BA9, 0xF4B8EDE3, 0x2111A506, 0xA38807EB,
+    0xDD22E7DF, 0xB10E49BC, 0xAE25CC79, 0xB5F2C286,
+    0x435DF8B8, 0xBE49EE3A, 0x79EDC6F8, 0xCB77DFEE,
+    0x0423040D, 0x1B2369F5, 0x2FDE7E31, 0xED8B68CD,
+    0x34A69221, 0x5189A93C, 0x55194F6F, 0x2527F431,
+    0x6D861874, 0x810F9886, 0xB10BB5B4, 0x96EBD377,
+    0xA0B08B28, 0xCE10D6EC, 0x9140C4D5, 0xF9DDD509,
+    0xC6C57C72, 0xEBA3B09E, 0xDA356C2B, 0xA7BEBF09,
+    0x28C36547, 0xE159BDEE, 0x59615BA8, 0x57C6A1B4,
+    0xAAEC1AC6, 0xEBE75A6A, 0xB3CFB56B, 0xFB29DB66,
+    0xBDD15C1C, 0xDE76A7C7, 0xCB7BF12A, 0x4428B198,
+    0x30B8DA8B, 0x707B8A08, 0xF4F07905, 0xC7FE9E43,
+    0xE7C65685, 0x35DFFB95, 0xE7F20990, 0x0257512D,
+    0x670FF754, 0xC283A4FB, 0x1F71031B, 0xDC913B0C,
+    0x1B6A08CA, 0x9CDEB23D, 0xA12AA9CD, 0x66B6B7F0,
+    0x8CDF8E31, 0x47734C8D, 0x745DF247, 0x56DEF9E0,
+    0x01143185, 0x4BA8F85B, 0xAD2F0D82, 0x42385B1E,
+    0x640DAAC6, 0xD61F73F2, 0xB12546D5, 0x519B075E,
+    0x0FB2F0A9, 0x71FFF1BF, 0xC04B0DB5, 0x2458562F,
+    0xD5FDB9B2, 0x29256750, 0x83B48B52, 0xD7F66EBC,
+    0x0EBBD726, 0x8E13337D, 0x4E490EF9, 0x6885D5AA,
+    0x83B775B0, 0x98BE50F9, 0xA9015D77, 0x41A149FA,
+    0xE8247C0D, 0x6DEEF22C, 0xDA1FF62B, 0x9595E9E9,
+    0x0A3AC385, 0x929672F8, 0x3C8A1439, 0xA12AADB8,
+    0xC4484F3D, 0xC301C98E, 0xF77AA1C9, 0xDDDD0A8F,
+    0x651848A7, 0xAA1BE553, 0x29796FCE, 0x6843B536,
+    0x9DE81BC1, 0x06359EB4, 0xEED4139E, 0x79938FFE,
+    0x7CCBE4BE, 0x4FE750DA, 0xC70C1AF6, 0x06122C2D,
+    0x3A1EF402, 0xCDEBECC8, 0x77165C62, 0x90950FA5,
+    0x60C7DA6F, 0xBF6D80F8, 0x37E3B6ED, 0x76505EEA,
+    0x7DE8A04E, 0x212A96B1, 0xA82C3881, 0xAEB468D9,
+    0x37A3DDF8, 0xB636F12E, 0x730FB649, 0x256C877F,
+    0xBABDF08E, 0x66FD57FE, 0x68899AE8, 0xFB1AD028,
+    0xD1C70F6F, 0x043A25E6, 0xC34C2684, 0x8573D2C2,
+    0x6E8DA6C7, 0xD5AB23D8, 0x401FBFE2, 0x88F8D19B,
+    0xE45C7C22, 0xEFEF791C, 0x6FDD11C2, 0x8FA2956A,
+    0xA11DA089, 0x492A26B3, 0x0D8CDCCD, 0xDC0F65F3,
+    0x17809BE1, 0xDF0F07EE, 0x783ED9D4, 0xF987FEE7,
+    0xB384D9D4, 0x311EA1C2, 0x11EF3456, 0x68D48C92,
+    0x92989570, 0x56D3F624, 0xF79BE86B, 0xD1C0431C,
+    0xAF8FE864, 0x6C3883DC, 0x3518CB9A, 0x3DE51902,
+    0xABD321D1, 0x500C6841, 0xEEDA7B06, 0x00E1A124,
+    0xE90E40D4, 0xFFDB0231, 0x7FA05C85, 0xDA7E8951,
+    0x82A03BAE, 0x2105F672, 0xC170D332, 0x703F74E1,
+    0xDC39A961, 0xD1162651, 0xA94060A2, 0x1BE0D3AD,
+    0x14A0FAC8, 0xCF710309, 0xB6F3E799, 0x34510662,
+    0x47EA8861, 0x08DBF24C, 0xDE244A69, 0x9FD7E20F,
+    0xC3101568, 0x6A805C2E, 0xB18330F5, 0xFC69D93B,
+    0xD53B612D, 0x1703F559, 0x46CDE97C, 0x780AA7F7,
+    0x8CFCECCC, 0xEB9B8A31, 0x901B5CB2, 0xD9394ECC,
+    0xE7571411, 0xDBEFD3A8, 0xF5F59113, 0x066D0DF2,
+    0xCE079DD8, 0x2FE9800A, 0x883547A4, 0x9252DEC3,
+    0x4AFFCBCC, 0xDBABE653, 0xD3412A25, 0x57BC71E4,
+    0xE5760375, 0x192D8A04, 0xF98AA0D1, 0xDF6B9468,
+    0x482E3447, 0x99F4C100, 0x8BAF39AA, 0x98FB2C24,
+    0x1A53ED4C, 0x717DF07B, 0x2A169BC3, 0xCF5B8C6A,
+    0xCF32830F, 0x53CB1228, 0x0658E29C, 0xBA87D158,
+    0x3F9D0CFD, 0x2BD81BAA, 0x430FE0E3, 0xCABB9E1E,
+    0xBC61AA28, 0x1B292D83, 0x697D0F26, 0x9F7D74AF,
+    0x5B376065, 0x08EA6F2F, 0xB7B833B0, 0x8E5525D7,
+    0xB3A2E210, 0x4D8EBD41, 0x0CF1A408, 0xB36C86CF,
+    0x72BE0574, 0xD5207CE2, 0x59BFB3BA, 0x130560EE,
+    0xD85680DF, 0x3432CBD9, 0xFB53C4A5, 0x2C535B42,
+    0xC8C01380, 0x1AD27247, 0x236EEA0F, 0xAAF0CFB9,
+    0x65EEC73D, 0x4B0798C9, 0x9CE19D85, 0x2E290A5F,
+    0x30F04207, 0x8A77F58E, 0x9A4B2BB2, 0xB830F4EA,
+    0x1DF72DB0, 0x1B22B95B, 0x8956CEA5, 0xA8179129,
+    0xC24BF1A2, 0x70F417F2, 0x29F2795B, 0xC76C645C,
+    0xB6B4B3F3, 0xDFE39306, 0xF998E979, 0x34644705,
+    0xCD600D78, 0xD99614B3, 0xB822CF53, 0xB46098A9,
+    0xCD999983, 0xAE8FA27D, 0xBF067694, 0xC1526C5D,
+    0x04AD40FD, 0x0C309AB6, 0x09139907, 0x47524C71,
+    0x77D01F2F, 0x11A0A483, 0xA113654F, 0x8838F24C,
+    0xBF916D40, 0x7B9F63B1, 0x476C97A6, 0x5F8FFAB9,
+    0x6839BBD4, 0xF391B2FB, 0x23398A35, 0x116FE04B,
+    0x1D429219, 0x1A5B77BD, 0xD0129762, 0x843C5C09,
+    0x30671252, 0xEB084193, 0x828E08F2, 0x864EA07C,
+    0x51E7B04F, 0xE60A8B25, 0xC11E8CF7, 0x45B0DA38,
+    0x1A8DC7BE, 0x642878D7, 0xCB47B65F, 0x6970790C,
+    0x0FC7F73E, 0x1A51AD05, 0x40E6A3EF, 0xEC6E233F,
+    0x093042D4, 0x5F979451, 0xE3808240, 0x644D835D,
+    0xD08BCAB8, 0x85A3F6BE, 0xD1DEC20A, 0x7A9D77A4,
+    0x406F1BDF, 0x4125A6A3, 0x284044FD, 0x4E15069B,
+    0x96432684, 0x297D9110, 0x71FCA36C, 0xB00DB44C,
+    0x6318E428, 0x43E716D4, 0x44A02F7C, 0x01849B29,
+    0xB091FAC8, 0x42CB6E89, 0x93AF806E, 0x517FAB11,
+    0x34A41457, 0x0DFD6E4F, 0x97688A5C, 0x0E8DBE5E,
+    0x0F2ED5BF, 0xEE1E1F18, 0xABE559AD, 0x94AB386F,
+    0x9EE5C1F3, 0x57FA28AC, 0x97B86030, 0x8DD7E65C,
+    0xEF3440B7, 0x256497B3, 0xC98F51E3, 0x821A9858,
+    0x1A3B90B5, 0xB0B5E1F0, 0xEDE5B614, 0xC7135414,
+    0xE711BB67, 0x7D9E27EA, 0xA93B5C6C, 0x38DD68B3,
+    0xD4D9BC71, 0x55293181, 0x65549512, 0x136C8378,
+    0x0CBC6A48, 0x93DE80AC, 0x6F075468, 0xECA399C2,
+    0x5B79DFF4, 0x6ACFC8F3, 0xE9F9B2A6, 0x28F6B50C,
+    0x1681ABEC, 0xCADF403F, 0xE2D61F5E, 0x566E84B6,
+    0x375D5C85, 0xFDC0345D, 0x7AE4ACC8, 0x5886DAE0,
+    0x2E5E16C7, 0x378D06BD, 0xB52F3F46, 0x3DC8A7C6,
+    0x68F06DC0, 0xADF3A244, 0xAC7ECD7A, 0x08E948DB,
+    0xC6E4CBEC, 0x490F8AD9, 0x6E01D0FF, 0xE1B3E076,
+    0x2AF48C69, 0x4D8EEC7E, 0x7A3F8D57, 0xB4B9A88C,
+    0x94FC4228, 0x818FECEC, 0x16720C6B, 0x3CE52421,
+    0x85DC8CC8, 0x4E93216C, 0x7404507A, 0xC9E03157,
+    0x027D838C, 0xB37C5EB6, 0x4FBFEF24, 0x5162C4C9,
+    0x4F86F513, 0x7E3CFF17, 0x6D0D4782, 0x778F8C05,
+    0x015B9323, 0xBC1E0898, 0x9F82700C, 0x097059B5,
+    0x1AB22782, 0xE652AE5F, 0xEDA42066, 0xB78EDF27,
+    0x7203E1E2, 0xCF8FC667, 0xD701956E, 0x4B7C4E54,
+    0x5D4120FE, 0x32FE9E0E, 0xBEB6F85B, 0x847181F0,
+    0x3A0F63C0, 0x61CA3C45, 0x323EFDD9, 0xB6E350AE,
+    0x778B3747, 0x149F34C9, 0xE7945322, 0xDB3306E3,
+    0xC010F938, 0x1CA4DE87, 0xE997F0C7, 0xBDDE566C,
+    0x0A9B51F3, 0xB49FABAF, 0x30721DB3, 0xAFCF764B,
+    0x5673FBB6, 0x1309FAB9, 0x76354265, 0xB4F6D064,
+    0x233FB489, 0x501A63F0, 0xE1A12AB1, 0x1E39E0B5,
+    0x91EA4EF3, 0x1DEF44C1, 0x10585DD5, 0xE081142C,
+    0xCFFA54FA, 0x09271FB7, 0x1CD82797, 0xBDF4B56A,
+    0x48163254, 0x3883E008, 0x2D9979E0, 0xB99D78DC,
+    0x718B22B7, 0x1C33796E, 0x9B1E4CD4, 0xA2FABE81,
+    0xAFB20FFF, 0xE93B9D32, 0x786E553A, 0xD4FCD58C,
+    0x39F74933, 0x9800D17F, 0xDEE3B402, 0x0B804EA4,
+    0xCA3D0801, 0x802E6C8D, 0x038FB934, 0xAA9A14E8,
+    0xA0DB278B, 0xA3E52E34, 0x019D4242, 0x5A0591C9,
+    0x9A62A5BD, 0xBFC094CC, 0x4ADE8AB2, 0xC1237653,
+    0x2D688FCB, 0x84142D61, 0xC0588D00, 0xB5E1A25C,
+    0x3C90B7AE, 0x5FEFE0AE, 0x567F5466, 0x7D9811A6,
+    0xE4A71714, 0x0A882DA3, 0x417D8596, 0xBCED79F7,
+    0xF9FAFC4D, 0xE994523E, 0x475C702D, 0x66FC58FE,
+    0xC2BAAFCF, 0x26C50786, 0xB4CC88C0, 0xDAA3C50C,
+    0xCCD395E5, 0xA86449CE, 0x3A1DB73B, 0xFC92B013,
+    0x6DCA1249, 0xB984D6BC, 0xB5C6C901, 0xAD413DFB,
+    0xCED3B802, 0x81702977, 0x9AD87CA9, 0x1D35F35E,
+    0x08B781C1, 0x6F841D95, 0x9A041F55, 0x334A83FF,
+    0x6F13AF2E, 0x4A2C59C4, 0x15E9C39A, 0xA0D72227,
+    0x957F857D, 0xA3D5896F, 0xA52E6D0E, 0xBE9C0BD1,
+    0xDB06B226, 0xE14FE53C, 0xD0210F68, 0xCC4F5565,
+    0xA15471D8, 0x5CBBE924, 0x65A5B975, 0x6C1546DC,
+    0xDB7C75D6, 0x61A31860, 0xD2D2C949, 0xF26572D7,
+    0xFC560A6F, 0xACA6DEEA, 0xBAAA460D, 0xAFE0FB3A,
+    0x007DD6CD, 0xB7AC9F63, 0x18AA2F9F, 0xC5B801C2,
+    0x957888F3, 0xC6999FC8, 0x77241C8C, 0xC76D8C5E,
+    0xA9920617, 0xEBE6DD6A, 0x23BD2F5F, 0xF700100C,
+    0x74DDCEB5, 0x0B1B6FEF, 0x9C7E56FA, 0x1D802072,
+    0xD0142F1F, 0x9401C828, 0x99B187F3, 0x5D43141A,
+    0xE3D4DA4E, 0x7B650A8D, 0x7C14C4F1, 0x3BF6C159,
+    0x78AB4396, 0x03740A8C, 0x8B6ED654, 0x4A93ECBF,
+    0xC635504F, 0xE8BC0572, 0x04CDA902, 0x90CA5F92,
+    0xF910349A, 0xAB3E306E, 0xC8821E4C, 0xF5EC7AEB,
+    0xABCB68C7, 0x064DEE85, 0xEF207CBF, 0x23AA4C62,
+    0xF0866801, 0x39473700, 0xECD9D59F, 0xEB2A2D37,
+    0xBEB0F708, 0xFD9F6629, 0x5FBD29DB, 0x5C2B8BFD,
+    0x9C56D5B1, 0xC7BD1311, 0xED84ADB3, 0x5CC80844,
+    0xCF2DAD67, 0x45D65467, 0x9DC6BD8D, 0x0EBFCEA4,
+    0x8F2688F2, 0x07CA2590, 0x6F60815D, 0x729D9CFE,
+    0xC93AE1AF, 0xABBE4CE8, 0x1897DE49, 0x38B9EAFE,
+    0x2521299F, 0xB57F000C, 0xD89DC0D2, 0x6A9C2356,
+    0xF77E9F6A, 0x378687D7, 0xCF6B4D9F, 0x3300717C,
+    0xB7A8F257, 0x2C28C3A6, 0x485EBEF4, 0x15E0B0A1,
+    0xF5B18250, 0xA9DB2390, 0x818031E4, 0x98D93A04,
+    0x10421186, 0xA5074032, 0xF42DF22C, 0x20AC233D,
+    0x9B54EDFC, 0x0C9C2D01, 0xCBDB8CE2, 0x78AB08F0,
+    0x6A555A1F, 0xD78B1136, 0x548B5EAE, 0x111A1EB8,
+    0x301B5BBB, 0x0E94D207, 0xD9E4E818, 0x5C2720B7,
+    0x296004F6, 0xC4696831, 0x7277FCEC, 0xBE3C32CE,
+    0xED0073A6, 0xEFF63557, 0x435C9F94, 0xF8A587D9,
+    0x7A820C2C, 0xA595F831, 0x3DCC2C4B, 0x80F2FFB2,
+    0x4F2F77B9, 0x05F7C510, 0xD0F5893E, 0x1F1B745A,
+    0xF5FB438D, 0xAD82F41A, 0x3DADF010, 0x2C5B2DA3,
+    0xE3CD713A, 0x85E4BDB8, 0x9393CC9B, 0x12A19FF5,
+    0x23E8CBCF, 0x57EF64F4, 0x1E1E001D, 0x2B57C2BF,
+    0x50671BA1, 0xE63EC000, 0xBAE5F6EF, 0xA16C5227,
+    0x993F6F36, 0xD92FDCE7, 0x8A81B38A, 0xB4DE62BB,
+    0xC009B68A, 0xDDFB68AE, 0xCB3576A9, 0xC6E14FFB,
+    0xE9649402, 0x2CA8F1AF, 0x4117A235, 0x5713963A,
+    0x35F55949, 0x9D18C6BF, 0x39D32421, 0xF1B20350,
+    0x4D26F28A, 0x94343838, 0xE46F1BA0, 0x66555F75,
+    0xDAC77E0D, 0x80BB088A, 0x62B54136, 0x1B748E06,
+    0x63B1C9F7, 0xE5500746, 0x5F3F281B, 0x441FCC75,
+    0x413109E2, 0x5C880E5A, 0x1CEE6951, 0x0986FCCB,
+    0x82920CCE, 0xCE3CD71E, 0x0CE990FD, 0x63B08C13,
+    0x90D58C75, 0x0F980B4A, 0x3CFDF6AA, 0x2B5074B1,
+    0x0CE18594, 0x115EE4EF, 0x65FCAD3D, 0xC2697F87,
+    0x437BA288, 0x11A945DC, 0x2583FA5D, 0xA28D1854,
+    0x33A2E04E, 0x1E337FA8, 0x7DB4C859, 0x15F6CFAF,
+    0x2DC83734, 0x11339203, 0x8DA9EB71, 0xFEB6E5B1,
+    0xB457BFE4, 0x13775D9B, 0x7A3B4A5A, 0xE6B82751,
+    0x06BAFFCE, 0x8AFCF734, 0x3560D6DD, 0x35AE549A,
+    0x688026F7, 0xBD57C468, 0x787E4BF9, 0x5DB5D682,
+    0x5C880D25, 0xAB9F39C3, 0x851DDA6B, 0x46929E87,
+    0xEA8C459B, 0xD2C70E8F, 0xAA5A47F2, 0x35832835,
+    0x19EFF8C3, 0x332CD734, 0xEDC7D985, 0x2FDAB802,
+    0xED0F0546, 0xE6AD5347, 0x0005D287, 0x7CA897B8,
+    0x42AEE5F5, 0x394CE900, 0x94F8F6B8, 0x1861BDE4,
+    0x58C19A81, 0x317DEA8C, 0x9CEF9976, 0xC9330178,
+    0x11C729DE, 0x8BABA452, 0x5C026F78, 0x98733EC6,
+    0x936086B4, 0x5EAB3A25, 0x69C3C1AB, 0x7E005EDF,
+    0x1F1D2B40, 0xEC188EA5, 0x3DBAA072, 0xCC137DE0,
+    0xC7C5184C, 0xC076A879, 0x0906947E, 0xF6FB9176,
+    0x1A0A7F76, 0x57811D15, 0x5EF5EE69, 0x71405559,
+    0x0EE76C5B, 0x240788F8, 0xB1A7621D, 0x847BA246,
+    0x8549AAC3, 0xB287C1B3, 0xF34389E4, 0xCB419173,
+    0xAFC447F7, 0x6A8B6616, 0x83760247, 0x03054AD6,
+    0xABEC9AD6, 0xA089CBCB, 0x3A7FB296, 0xB6EA9A0E,
+    0xB9F1642B, 0xEF8A703F, 0xD1971717, 0x6EAED0BD,
+    0xE6CEFB52, 0x1810C1DF, 0x51002397, 0xFBE24F1C,
+    0x349361A2, 0x707BF7BA, 0x302AC54F, 0x204B1070,
+    0xDB448339, 0x71631EFD, 0xD95EFD34, 0x649E7F50,
+    0x3B00AF30, 0x4C5C42C2, 0x08176FFE, 0x018120EB,
+    0xB3858456, 0x823FD343, 0x24032AC5, 0x9BFE5D2A,
+    0xCC91212B, 0xBAEAEE5E, 0xB04F500D, 0x1688BC27,
+    0xB4BBD5B0, 0x663E766A, 0x6B897DEB, 0x746B1B6D,
+    0xB05413D8, 0x64F412BC, 0x627880F6, 0x0E1DDE76,
+    0x6212BEF0, 0x29F8CA19, 0xC969DE15, 0xA3334B48,
+    0xB6C5EA83, 0x695CCAC2, 0x11F81723, 0xA030E83C,
+    0x1CE43DA7, 0x0B9252F7, 0xAA074855, 0x7D8EB5CF,
+    0xE21DA035, 0x8244D125, 0x0DF04038, 0x45B90D1F,
+    0xECD6D524, 0x34901ED5, 0xC9C8B191, 0x99F79A98,
+    0x726AB026, 0x53CF5C47, 0xBF518C71, 0x26FA6F6D,
+    0x76B02007, 0xAD7636BF, 0xF410E522, 0x9B128679,
+    0xFEA143C3, 0xA959FCD9, 0xF923C050, 0x1709BB5D,
+    0x8C7D5DD0, 0x07E7DF0B, 0x0F78C514, 0x8B5DCE61,
+    0xDA17DDB3, 0x53F67F7C, 0xEABB155A, 0x8E553A6B,
+    0x22564774, 0xF54884BC, 0x1B28EDE5, 0x420F5D28,
+    0x470DAE2D, 0x25188761, 0x64C8724C, 0x14B6B18F,
+    0xE174629F, 0x3B8FF546, 0x23B4792B, 0xCA257135,
+    0xCCCFE0DF, 0x097B23CA, 0xC9A34205, 0x69BC837A,
+    0x9CDE5F04, 0x7B936B82, 0x798C5DBD, 0x930103EA,
+    0x4917E75C, 0x83F73140, 0x3FE4BF5A, 0x95A8F35B,
+    0x1CA27A9C, 0xFD594586, 0xF157EF47, 0x46A137E4,
+    0x571C0CD9, 0xD3D075E5, 0xFA90A3BA, 0x892BEFEB,
+    0xEDAA4E4A, 0xCB72095F, 0x2ED49591, 0x65851CBB,
+    0x0E538547, 0x6400BB24, 0xC76D6CC6, 0xB73800D0,
+    0x01411C3B, 0x4F4B51A7, 0xF8B84EFA, 0x65FD4FC0,
+    0x4E7372F0, 0x0CAB4604, 0xF6AB9F0E, 0xB5D27AAB,
+    0xB0D8FE89, 0x6DE6B2B4, 0xBD0A057A, 0x29F00DD9,
+    0x4E479195, 0xCF528E35, 0xED4D0D87, 0xEE0B161A,
+    0xC55BD857, 0x5B560380,
+])
@@ -0,0 +1,164 @@
+import blowfish_mod
+
+SPATIAL_CELL_SIZE = 50.0
+SPATIAL_TIME_BUCKET = 5.0
+SPATIAL_TIME_TOLERANCE = 1.0
+SPATIAL_INDEX_SUFFIX = '.sidx.npz'
+SPATIAL_INDEX_VERSION = 1
+SPATIAL_COLUMNS = ('clock', 'entity_id', 'x', 'y', 'z')
+
+
+def require_numpy():
+    numpy = blowfish_mod.load_numpy()
+    if numpy is None:
+        raise ImportError("numpy is required to build a spatial index")
+    return numpy
+
+
+class SpatialIndex(object):
+    def __init__(self, columns, cell_size=SPATIAL_CELL_SIZE, time_bucket=SPATIAL_TIME_BUCKET, data_length=0):
+        numpy = require_numpy()
+        self.numpy = numpy
+        self.cell_size = float(cell_size)
+        self.time_bucket = float(time_bucket)
+        self.data_length = int(data_length)
+        columns = {field: numpy.asarray(columns[field]) for field in SPATIAL_COLUMNS}
+        if len(columns['clock']):
+            self.origin_x = float(columns['x'].min())
+            self.origin_z = float(columns['z'].min())
+            self.cells_x = int((columns['x'].max() - self.origin_x) // self.cell_size) + 1
+            self.cells_z = int((columns['z'].max() - self.origin_z) // self.cell_size) + 1
+        else:
+            self.origin_x = self.origin_z = 0.0
+            self.cells_x = self.cells_z = 1
+        keys = self.cell_keys(self.bucket_of(columns['clock']), self.cell_x_of(columns['x']),
+                              self.cell_z_of(columns['z']))
+        order = numpy.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.columns = {field: column[order] for field, column in columns.items()}
+
+    @classmethod
+    def from_replay(cls, replay, cell_size=SPATIAL_CELL_SIZE, time_bucket=SPATIAL_TIME_BUCKET, packet_types=(1, 5)):
+        numpy = require_numpy()
+        table = replay.packet_table(packet_types)
+        table = table[(table['entity_id'] != 0) & ~numpy.isnan(table['x'])]
+        columns = {field: table[field] for field in SPATIAL_COLUMNS}
+        return cls(columns, cell_size, time_bucket, len(replay.data_gameplay) if replay.data_gameplay else 0)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def bucket_of(self, clock):
+        return self.numpy.floor_divide(clock, self.time_bucket).astype('int64')
+
+    def cell_x_of(self, x):
+        return self.numpy.clip(self.numpy.floor_divide(self.numpy.asarray(x) - self.origin_x, self.cell_size),
+                               0, self.cells_x - 1).astype('int64')
+
+    def cell_z_of(self, z):
+        return self.numpy.clip(self.numpy.floor_divide(self.numpy.asarray(z) - self.origin_z, self.cell_size),
+                               0, self.cells_z - 1).astype('int64')
+
+    def cell_keys(self, bucket, cell_x, cell_z):
+        return (bucket * self.cells_x + cell_x) * self.cells_z + cell_z
+
+    def candidate_rows(self, x0, z0, x1, z1, t0, t1):
+        numpy = self.numpy
+        buckets = numpy.arange(int(self.bucket_of(t0)), int(self.bucket_of(t1)) + 1, dtype='int64')
+        cells_x = numpy.arange(int(self.cell_x_of(x0)), int(self.cell_x_of(x1)) + 1, dtype='int64')
+        bucket_grid, cell_x_grid = numpy.meshgrid(buckets, cells_x, indexing='ij')
+        bucket_grid, cell_x_grid = bucket_grid.ravel(), cell_x_grid.ravel()
+        starts = numpy.searchsorted(self.keys, self.cell_keys(bucket_grid, cell_x_grid, int(self.cell_z_of(z0))), 'left')
+        ends = numpy.searchsorted(self.keys, self.cell_keys(bucket_grid, cell_x_grid, int(self.cell_z_of(z1))), 'right')
+        lengths = ends - starts
+        total = int(lengths.sum())
+        if not total: return numpy.zeros(0, dtype='int64')
+        run_offsets = numpy.repeat(starts - numpy.concatenate(([0], numpy.cumsum(lengths)[:-1])), lengths)
+        return run_offsets + numpy.arange(total, dtype='int64')
+
+    def select(self, rows):
+        return {field: column[rows] for field, column in self.columns.items()}
+
+    def query_rectangle(self, x0, z0, x1, z1, t0=float('-inf'), t1=float('inf')):
+        x0, x1 = min(x0, x1), max(x0, x1)
+        z0, z1 = min(z0, z1), max(z0, z1)
+        t0, t1 = max(t0, self.min_clock()), min(t1, self.max_clock())
+        if not len(self) or t0 > t1: return self.select(self.numpy.zeros(0, dtype='int64'))
+        rows = self.candidate_rows(x0, z0, x1, z1, t0, t1)
+        clock, x, z = self.columns['clock'][rows], self.columns['x'][rows], self.columns['z'][rows]
+        rows = rows[(clock >= t0) & (clock <= t1) & (x >= x0) & (x <= x1) & (z >= z0) & (z <= z1)]
+        return self.select(self.numpy.sort(rows))
+
+    def query_radius(self, x, z, radius, t0=float('-inf'), t1=float('inf')):
+        result = self.query_rectangle(x - radius, z - radius, x + radius, z + radius, t0, t1)
+        distance = self.numpy.hypot(result['x'] - x, result['z'] - z)
+        inside = distance <= radius
+        result = {field: column[inside] for field, column in result.items()}
+        result['distance'] = distance[inside]
+        return result
+
+    def near_entity(self, entity_id, radius, t0=float('-inf'), t1=float('inf'),
+                    tolerance=SPATIAL_TIME_TOLERANCE, entity_ids=None):
+        numpy = self.numpy
+        own = self.columns['entity_id'] == entity_id
+        own &= (self.columns['clock'] >= t0) & (self.columns['clock'] <= t1)
+        nearest = {}
+        for clock, x, z in zip(self.columns['clock'][own], self.columns['x'][own], self.columns['z'][own]):
+            result = self.query_radius(x, z, radius, clock - tolerance, clock + tolerance)
+            others = result['entity_id'] != entity_id
+            if entity_ids is not None:
+                others &= numpy.isin(result['entity_id'], list(entity_ids))
+            for other_id, distance, other_clock in zip(result['entity_id'][others], result['distance'][others],
+                                                       result['clock'][others]):
+                other_id = int(other_id)
+                if other_id not in nearest or distance < nearest[other_id]['distance']:
+                    nearest[other_id] = {'distance': float(distance), 'clock': float(other_clock),
+                                         'entity_clock': float(clock)}
+        return nearest
+
+    def min_clock(self):
+        return float(self.columns['clock'].min()) if len(self) else 0.0
+
+    def max_clock(self):
+        return float(self.columns['clock'].max()) if len(self) else 0.0
+
+    def save(self, index_path):
+        meta = self.numpy.array([SPATIAL_INDEX_VERSION, self.cell_size, self.time_bucket, self.data_length],
+                                dtype='float64')
+        with open(index_path, 'wb') as index_file:
+            self.numpy.savez(index_file, meta=meta, **self.columns)
+        return index_path
+
+    @classmethod
+    def load(cls, index_path, data_length=None):
+        numpy = require_numpy()
+        try:
+            with numpy.load(index_path) as archive:
+                meta = archive['meta']
+                columns = {field: archive[field] for field in SPATIAL_COLUMNS}
+        except (OSError, KeyError, ValueError, TypeError):
+            return None
+        version, cell_size, time_bucket, stored_length = meta.tolist()
+        if int(version) != SPATIAL_INDEX_VERSION: return None
+        if data_length is not None and int(stored_length) != data_length: return None
+        return cls(columns, cell_size, time_bucket, stored_length)
+
+
+def spatial_index_path(replay):
+    if replay.replay_path is None: return None
+    return replay.replay_path.with_name(replay.replay_path.name + SPATIAL_INDEX_SUFFIX)
+
+
+def get_spatial_index(replay, cell_size=SPATIAL_CELL_SIZE, time_bucket=SPATIAL_TIME_BUCKET, save=True):
+    index_path = spatial_index_path(replay)
+    data_length = len(replay.data_gameplay) if replay.data_gameplay else 0
+    spatial_index = SpatialIndex.load(index_path, data_length) if index_path is not None else None
+    if spatial_index is not None and spatial_index.cell_size == cell_size and spatial_index.time_bucket == time_bucket:
+        return spatial_index
+    spatial_index = SpatialIndex.from_replay(replay, cell_size, time_bucket)
+    if save and index_path is not None:
+        try:
+            spatial_index.save(index_path)
+        except OSError:
+            pass
+    return spatial_index
@@ -0,0 +1,107 @@
+import json, os, pathlib, time
+
+CATALOG_TTL = 24 * 60 * 60
+default_catalog = None
+
+
+def user_cache_dir():
+    # Per-user location, so another account cannot plant or swap the snapshot as it could in the shared temp dir.
+    base = os.environ.get('LOCALAPPDATA') if os.name == 'nt' else os.environ.get('XDG_CACHE_HOME')
+    return pathlib.Path(base or pathlib.Path.home() / '.cache') / 'wot_replay_parser'
+
+
+SNAPSHOT_PATH = user_cache_dir() / 'tank_catalog.json'
+
+
+def wot_statistic_provider():
+    from wot_statistic import get_all_tanks
+    return get_all_tanks()
+
+
+class LocalTankProvider(object):
+    def __init__(self, tanks):
+        self.tanks = tanks
+
+    def __call__(self):
+        if isinstance(self.tanks, dict):
+            return self.tanks
+        with open(self.tanks, 'r', encoding='utf-8') as tanks_file:
+            return json.load(tanks_file)
+
+
+class TankCatalog(object):
+    def __init__(self, provider=wot_statistic_provider, snapshot_path=SNAPSHOT_PATH, ttl=CATALOG_TTL):
+        self.provider = provider
+        self.snapshot_path = pathlib.Path(snapshot_path) if snapshot_path else None
+        self.ttl = ttl
+        self.tanks = None
+
+    def load(self):
+        if self.tanks is not None:
+            return self.tanks
+        tanks = None
+        snapshot_age = self.snapshot_age()
+        if snapshot_age is not None and snapshot_age < self.ttl:
+            tanks = self.read_snapshot()
+        if tanks is None:
+            try:
+                tanks = self.provider()
+            except Exception:
+                tanks = self.read_snapshot() if snapshot_age is not None else None
+                if tanks is None:
+                    raise
+            else:
+                self.write_snapshot(tanks)
+        self.tanks = {}
+        for type_comp_descr, tank in tanks.items():
+            try:
+                self.tanks[int(type_comp_descr)] = tank
+            except (TypeError, ValueError):
+                continue
+        return self.tanks
+
+    def snapshot_age(self):
+        if self.snapshot_path is None: return None
+        try:
+            return time.time() - self.snapshot_path.stat().st_mtime
+        except OSError:
+            return None
+
+    def read_snapshot(self):
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as snapshot:
+                return json.load(snapshot)
+        except (OSError, ValueError):
+            return None
+
+    def write_snapshot(self, tanks):
+        if self.snapshot_path is None: return
+        temp_path = self.snapshot_path.with_name('%s.%s.tmp' % (self.snapshot_path.name, os.getpid()))
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as snapshot:
+                json.dump(tanks, snapshot)
+            os.replace(temp_path, self.snapshot_path)
+        except (OSError, TypeError, ValueError):
+            pass
+
+    def get(self, type_comp_descr, default=None):
+        return self.load().get(type_comp_descr, default)
+
+    def get_short_name(self, type_comp_descr, default=None):
+        tank = self.get(type_comp_descr)
+        if tank and 'short_name' in tank:
+            return tank['short_name']
+        return default
+
+
+def get_tank_catalog():
+    global default_catalog
+    if default_catalog is None:
+        default_catalog = TankCatalog()
+    return default_catalog
+
+
+def set_tank_catalog(catalog):
+    global default_catalog
+    default_catalog = catalog
@@ -0,0 +1,74 @@
+import pathlib, random, struct, sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+import pytest
+import blowfish_mod
+import replay_generator
+
+PACKET_COUNT = 3000
+VEHICLE_COUNT = 10
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def numpy_mode(request, monkeypatch):
+    if request.param == 'numpy':
+        if blowfish_mod.load_numpy() is None:
+            pytest.skip("numpy is not installed")
+    else:
+        monkeypatch.setattr(blowfish_mod, 'numpy', None)
+    return request.param
+
+
+@pytest.fixture(scope='session')
+def data_head():
+    return replay_generator.build_head_blocks(VEHICLE_COUNT, 0)
+
+
+@pytest.fixture(scope='session')
+def gameplay(data_head):
+    return replay_generator.build_packets(data_head, PACKET_COUNT, 0)
+
+
+@pytest.fixture(scope='session')
+def replay_bytes(data_head, gameplay):
+    return replay_generator.build_replay(data_head=data_head, gameplay=gameplay)
+
+
+@pytest.fixture
+def replay_path(tmp_path, replay_bytes):
+    path = tmp_path / 'synthetic.wotreplay'
+    path.write_bytes(replay_bytes)
+    return path
+
+
+@pytest.fixture(scope='session')
+def lifecycle_gameplay(data_head):
+    # build_packets only emits types 0/1/5/35; mix in world (2), enter/leave (4/6/7) packets.
+    generator = random.Random(3)
+    vehicles = data_head[0]['vehicles']
+    avatar_ids = [int(avatar_id) for avatar_id in vehicles]
+    packets = [replay_generator.pack_packet(0, 0.0, replay_generator.battle_setup_body(
+        data_head[0]['playerName'], data_head[0]['playerID']))]
+    for avatar_id in avatar_ids[:VEHICLE_COUNT // 2]:
+        packets.append(replay_generator.pack_packet(5, 0.0, replay_generator.entity_create_body(
+            avatar_id, [0.0, 0.0, 0.0], vehicles[str(avatar_id)]['name'])))
+    clock = 0.0
+    for i in range(PACKET_COUNT):
+        clock += generator.random() * 0.2
+        avatar_id = generator.choice(avatar_ids)
+        packet_type = generator.choice([1, 1, 1, 2, 4, 6, 7, 35])
+        if packet_type == 1:
+            body = replay_generator.position_body(avatar_id, [generator.uniform(-500, 500), 10.0,
+                                                              generator.uniform(-500, 500)])
+        elif packet_type == 35:
+            body = replay_generator.chat_body('message %s' % i)
+        else:
+            body = struct.pack('<i', avatar_id) + bytes(8)
+        packets.append(replay_generator.pack_packet(packet_type, clock, body))
+    return b''.join(packets)
+
+
+@pytest.fixture(scope='session')
+def lifecycle_replay_bytes(data_head, lifecycle_gameplay):
+    return replay_generator.build_replay(data_head=data_head, gameplay=lifecycle_gameplay)
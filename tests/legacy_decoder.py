@@ -0,0 +1,188 @@
+# The packet decoder as it was before the PACKET_DECODERS registry, kept verbatim so the
+# registry-based decode_gameplay() can be checked against it.
+import struct
+from full_replay_parser import LENGTH_STRUCT, CLOCK_STRUCT, CORD_STRUCT, B_STRUCT, C_STRUCT
+
+
+def decode_gameplay(data_gameplay):
+    packets = []
+    cursor = 0
+    while cursor + 8 <= len(data_gameplay):
+        payload_length, packet_type = struct.unpack_from("<ii", data_gameplay, cursor)
+        cursor += 8
+        payload = data_gameplay[cursor:cursor + payload_length + 4]
+        if not payload: break
+        cursor += payload_length + 4
+        packets.append({
+            'payload_length': payload_length,
+            'packet_type': packet_type,
+            'packet_data': decode_packet(payload, packet_type, payload_length),
+            'payload': payload,
+        })
+    return packets
+
+
+def decode_packet(payload, packet_type, payload_length=None):
+    if not payload or packet_type is None: return {}
+    temp_data = {}
+    cursor = 0
+    clock = CLOCK_STRUCT.unpack(payload[cursor:cursor+CLOCK_STRUCT.size])[0]
+    if clock is not None:
+        temp_data['clock'] = clock
+    cursor += CLOCK_STRUCT.size
+    if packet_type == 0:
+        edited = payload[cursor:cursor + LENGTH_STRUCT.size]
+        unknown_id = LENGTH_STRUCT.unpack(edited)[0]
+        if unknown_id:
+            temp_data['unknown_id'] = unknown_id
+        name_len_STRUCT = struct.Struct(">i")
+        cursor += 11
+        edited = payload[cursor:cursor + name_len_STRUCT.size]
+        name_len = name_len_STRUCT.unpack(edited)[0]
+        cursor += LENGTH_STRUCT.size
+        nick_name = bytes(payload[cursor:cursor + name_len]).decode("utf-8")
+        if nick_name:
+            temp_data['nick_name'] = nick_name
+        cursor += name_len
+
+        len_game_player_id = payload[cursor]
+        cursor += 1
+
+        game_player_id = int(bytes(payload[cursor:cursor + len_game_player_id]))
+        if game_player_id:
+            temp_data['game_player_id'] = game_player_id
+        cursor += len_game_player_id
+
+        timestamp_start = LENGTH_STRUCT.unpack(payload[cursor:cursor + LENGTH_STRUCT.size])[0]
+        if timestamp_start:
+            temp_data['timestamp_start'] = timestamp_start
+        cursor += LENGTH_STRUCT.size + 33
+
+        gameParamsRev = bytes(payload[cursor:cursor + 16]).decode("utf-8")
+        if gameParamsRev:
+            temp_data['gameParamsRev'] = gameParamsRev
+        cursor += 30
+
+        edited = payload[cursor:cursor + B_STRUCT.size]
+        battleLevel_index = B_STRUCT.unpack(edited)[0]
+        cursor += B_STRUCT.size
+        battleLevel = None
+        if battleLevel_index == 75:
+            edited = payload[cursor:cursor + C_STRUCT.size]
+            battleLevel = ord(C_STRUCT.unpack(edited)[0])
+            cursor += C_STRUCT.size
+        elif battleLevel_index == 74:
+            edited = payload[cursor:cursor + LENGTH_STRUCT.size]
+            battleLevel = LENGTH_STRUCT.unpack(edited)[0]
+            cursor += LENGTH_STRUCT.size
+        if battleLevel is not None:
+            temp_data['battleLevel'] = battleLevel
+        cursor += 13
+
+        edited = payload[cursor:cursor + B_STRUCT.size]
+        arenaTypeID_index = B_STRUCT.unpack(edited)[0]
+        cursor += B_STRUCT.size
+        arenaTypeID = None
+        if arenaTypeID_index == 75:
+            edited = payload[cursor:cursor + C_STRUCT.size]
+            arenaTypeID = ord(C_STRUCT.unpack(edited)[0])
+            cursor += C_STRUCT.size
+        elif arenaTypeID_index == 74:
+            edited = payload[cursor:cursor + LENGTH_STRUCT.size]
+            arenaTypeID = LENGTH_STRUCT.unpack(edited)[0]
+            cursor += LENGTH_STRUCT.size
+        if arenaTypeID is not None:
+            temp_data['arenaTypeID'] = arenaTypeID
+        cursor += 11
+
+        edited = payload[cursor:cursor + B_STRUCT.size]
+        arenaKind_index = B_STRUCT.unpack(edited)[0]
+        cursor += B_STRUCT.size
+        arenaKind = None
+        if arenaKind_index == 75:
+            edited = payload[cursor:cursor + C_STRUCT.size]
+            arenaKind = ord(C_STRUCT.unpack(edited)[0])
+            cursor += C_STRUCT.size
+        elif arenaKind_index == 74:
+            edited = payload[cursor:cursor + LENGTH_STRUCT.size]
+            arenaKind = LENGTH_STRUCT.unpack(edited)[0]
+            cursor += LENGTH_STRUCT.size
+        if arenaKind is not None:
+            temp_data['arenaKind'] = arenaKind
+    elif packet_type == 1:
+        cluster = payload[cursor:cursor + LENGTH_STRUCT.size]
+        world_id = LENGTH_STRUCT.unpack(cluster)[0]
+        if world_id:
+            temp_data['world_id'] = world_id
+        cursor = 14
+        cluster = payload[cursor:cursor + LENGTH_STRUCT.size]
+        entity_id = LENGTH_STRUCT.unpack(cluster)[0]
+        if entity_id:
+            temp_data['entity_id'] = entity_id
+        cursor += LENGTH_STRUCT.size
+        cluster = payload[cursor:cursor + CORD_STRUCT.size]
+        coordinate = CORD_STRUCT.unpack(cluster)
+        if coordinate:
+            temp_data['coordinate'] = coordinate
+    elif packet_type == 2:
+        cluster = payload[cursor:cursor + LENGTH_STRUCT.size]
+        world_id = LENGTH_STRUCT.unpack(cluster)[0]
+        if world_id:
+            temp_data['world_id'] = world_id
+    elif packet_type in [4, 7]:
+        cluster = payload[cursor:cursor + LENGTH_STRUCT.size]
+        entity_id = LENGTH_STRUCT.unpack(cluster)[0]
+        if entity_id:
+            temp_data['entity_id'] = entity_id
+    elif packet_type == 5:
+        cluster = payload[cursor:cursor + LENGTH_STRUCT.size]
+        entity_id = LENGTH_STRUCT.unpack(cluster)[0]
+        if entity_id:
+            temp_data['entity_id'] = entity_id
+        cursor += LENGTH_STRUCT.size
+
+        cluster = payload[cursor:cursor + LENGTH_STRUCT.size]
+        entity_type = LENGTH_STRUCT.unpack(cluster)[0]
+        if entity_type:
+            temp_data['entity_type'] = entity_type
+        cursor += LENGTH_STRUCT.size + 10
+
+        cluster = payload[cursor:cursor + CORD_STRUCT.size]
+        coordinate = CORD_STRUCT.unpack(cluster)
+        if coordinate:
+            temp_data['coordinate'] = coordinate
+
+        if entity_type == 6:
+            cursor = 61
+            cluster = payload[cursor:cursor + B_STRUCT.size]
+            type_byte = B_STRUCT.unpack(cluster)[0]
+            cursor += B_STRUCT.size
+            len_nickname = None
+            if type_byte == 12:
+                cursor += 3
+                cluster = payload[cursor:cursor + B_STRUCT.size]
+                len_nickname = B_STRUCT.unpack(cluster)[0]
+                cursor += B_STRUCT.size
+            elif type_byte == 20:
+                cluster = payload[cursor:cursor + B_STRUCT.size]
+                len_nickname = B_STRUCT.unpack(cluster)[0]
+                cursor += B_STRUCT.size
+            if len_nickname:
+                nick_name = bytes(payload[cursor:cursor + len_nickname])
+                if nick_name:
+                    temp_data['nick_name'] = nick_name
+    elif packet_type == 6:
+        cluster = payload[cursor:cursor + LENGTH_STRUCT.size]
+        entity_id = LENGTH_STRUCT.unpack(cluster)[0]
+        if entity_id:
+            temp_data['entity_id'] = entity_id
+        cursor += LENGTH_STRUCT.size
+    elif packet_type == 35:
+        cluster = payload[cursor:cursor + LENGTH_STRUCT.size]
+        len_text = LENGTH_STRUCT.unpack(cluster)[0]
+        cursor += LENGTH_STRUCT.size
+        message_user = bytes(payload[cursor:cursor+len_text]).decode()
+        if message_user:
+            temp_data['message_user'] = message_user
+
+    return temp_data
@@ -0,0 +1,84 @@
+# The header scans as they were before HeaderIndex, kept verbatim so the indexed player
+# helpers can be checked against them.
+
+
+class LegacyHeader(object):
+    def __init__(self, data_head):
+        self.data_head = data_head
+
+    def get_player_team_id(self):
+        player_nick_name = None
+        for i in self.data_head:
+            if 'playerName' in i:
+                player_nick_name = i['playerName']
+            if 'vehicles' in i and player_nick_name:
+                for game_player_id in i['vehicles']:
+                    if 'name' in i['vehicles'][game_player_id] and  player_nick_name == i['vehicles'][game_player_id]['name']:
+                        return i['vehicles'][game_player_id]['team']
+
+    def is_player_win(self):
+        player_team_id = self.get_player_team_id()
+        if not player_team_id: return None
+        for i in self.data_head:
+            if type(i) is list:
+                for j in i:
+                    if 'common' in j and 'winnerTeam' in j['common']:
+                        if player_team_id == j['common']['winnerTeam']:
+                            return True
+                        else:
+                            return False
+
+    def get_player_info(self):
+        wg_player_id = None
+        player_name = None
+        for i in self.data_head:
+            if 'playerID' in i:
+                wg_player_id = i['playerID']
+            if 'playerName' in i:
+                player_name = i['playerName']
+
+        if not wg_player_id or not player_name: return None
+        player_data = {}
+        for i in self.data_head:
+            if type(i) is dict and 'vehicles' in i:
+                for game_player_id in i['vehicles']:
+                    if 'name' in i['vehicles'][game_player_id] and player_name == i['vehicles'][game_player_id]['name']:
+                        player_data['game_player_id'] = game_player_id
+                        player_data['info'] = i['vehicles'][game_player_id]
+            if type(i) is list and 'game_player_id' in player_data:
+                for j in i:
+                    if 'vehicles' in j and player_data['game_player_id'] in j['vehicles']:
+                        player_data['battle_info'] = j['vehicles'][player_data['game_player_id']]
+        return player_data
+
+    def get_player_info_by_avatar_id(self, avatar_id):
+        user_data = {}
+        for i in self.data_head:
+            if type(i) is dict and 'vehicles' in i and avatar_id in i['vehicles']:
+                user_data['game_player_id'] = avatar_id
+                user_data['info'] = i['vehicles'][avatar_id]
+            if type(i) is list:
+                for j in i:
+                    if 'vehicles' in j and avatar_id in j['vehicles']:
+                        user_data['battle_info'] = j['vehicles'][avatar_id]
+        return user_data
+
+    def get_player_team_info(self):
+        player_team_id = self.get_player_team_id()
+        player_team_data = []
+        for i in self.data_head:
+            if type(i) is dict and 'vehicles' in i:
+                for game_player_id in i['vehicles']:
+                    if 'team' in i['vehicles'][game_player_id] and player_team_id == i['vehicles'][game_player_id]['team']:
+                        player_team_data.append(self.get_player_info_by_avatar_id(game_player_id))
+        return player_team_data
+
+    def get_player_enemy_info(self):
+        player_team_id = self.get_player_team_id()
+        player_enemy_data = []
+        for i in self.data_head:
+            if type(i) is dict and 'vehicles' in i:
+                for game_player_id in i['vehicles']:
+                    if 'team' in i['vehicles'][game_player_id] and player_team_id != i['vehicles'][game_player_id]['team']:
+                        player_enemy_data.append(self.get_player_info_by_avatar_id(game_player_id))
+        return player_enemy_data
@@ -0,0 +1,52 @@
+import multiprocessing, os
+
+import pytest
+import batch_parser
+import replay_generator
+
+requires_fork = pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                                   reason="workers must inherit the patched parse_one")
+
+
+@pytest.fixture
+def replay_paths(tmp_path):
+    paths = []
+    for seed in range(24):
+        path = tmp_path / ('replay_%02d.wotreplay' % seed)
+        path.write_bytes(replay_generator.build_replay(50, 4, seed))
+        paths.append(str(path))
+    return paths
+
+
+def test_parse_many_reports_every_path(replay_paths, tmp_path):
+    missing = str(tmp_path / 'missing.wotreplay')
+    results = list(batch_parser.parse_many(replay_paths + [missing], workers=2, chunk_size=5))
+    assert sorted(result['path'] for result in results) == sorted(replay_paths + [missing])
+    errors = {result['path']: result['error'] for result in results if result['error']}
+    assert list(errors) == [missing] and errors[missing].startswith('FileNotFoundError')
+    assert all(result['summary']['map'] == 'Himmelsdorf' for result in results if not result['error'])
+
+
+@requires_fork
+def test_parse_many_survives_dead_workers(replay_paths, monkeypatch):
+    crashing = {replay_paths[3], replay_paths[17]}
+    parse_one = batch_parser.parse_one
+
+    def parse_or_die(replay_path, only_head=True):
+        if replay_path in crashing:
+            os._exit(1)
+        return parse_one(replay_path, only_head)
+
+    monkeypatch.setattr(batch_parser, 'parse_one', parse_or_die)
+    results = list(batch_parser.parse_many(replay_paths, workers=3, chunk_size=4))
+    assert sorted(result['path'] for result in results) == sorted(replay_paths)
+    errors = {result['path']: result['error'] for result in results if result['error']}
+    assert set(errors) == crashing
+    assert all(error.startswith('BrokenProcessPool') for error in errors.values())
+
+
+def test_parse_many_stops_early(replay_paths):
+    results = batch_parser.parse_many(replay_paths, workers=2, chunk_size=1)
+    first = next(results)
+    results.close()
+    assert first['path'] in replay_paths
@@ -0,0 +1,74 @@
+import asyncio, concurrent.futures, threading, time
+
+import replay_async
+
+
+def test_limiter_bounds_work_in_flight_across_cancellations():
+    lock = threading.Lock()
+    counts = {'running': 0, 'peak': 0}
+
+    def job(value):
+        with lock:
+            counts['running'] += 1
+            counts['peak'] = max(counts['peak'], counts['running'])
+        time.sleep(0.05)
+        with lock:
+            counts['running'] -= 1
+        return value
+
+    async def main():
+        parser = replay_async.AsyncReplayParser(concurrent.futures.ThreadPoolExecutor(16), max_concurrency=2)
+        for _ in range(3):
+            tasks = [asyncio.ensure_future(parser.run(job, i)) for i in range(6)]
+            await asyncio.sleep(0.01)
+            for task in tasks:
+                task.cancel()
+        results = await asyncio.gather(*[parser.run(job, i) for i in range(4)])
+        await asyncio.sleep(0.1)
+        return results, parser.limiter._value
+
+    results, free_slots = asyncio.run(main())
+    assert results == [0, 1, 2, 3]
+    assert counts['peak'] <= 2
+    assert free_slots == 2
+
+
+def test_cancelled_caller_drops_queued_job():
+    started = threading.Event()
+    release = threading.Event()
+    ran = []
+
+    def job(value):
+        ran.append(value)
+        if value == 1:
+            started.set()
+            release.wait(5)
+        return value
+
+    async def main():
+        parser = replay_async.AsyncReplayParser(concurrent.futures.ThreadPoolExecutor(1), max_concurrency=4)
+        first = asyncio.ensure_future(parser.run(job, 1))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        second = asyncio.ensure_future(parser.run(job, 2))
+        await asyncio.sleep(0.01)
+        second.cancel()
+        await asyncio.sleep(0.01)
+        assert parser.limiter._value == 3
+        release.set()
+        assert await first == 1
+        await asyncio.sleep(0.05)
+        return second.cancelled(), parser.limiter._value
+
+    cancelled, free_slots = asyncio.run(main())
+    assert cancelled
+    assert ran == [1]
+    assert free_slots == 4
+
+
+def test_parse_buffer_in_process_pool(replay_bytes, data_head):
+    async def main():
+        with concurrent.futures.ProcessPoolExecutor(1) as executor:
+            parser = replay_async.AsyncReplayParser(executor)
+            return await parser.parse(memoryview(replay_bytes))
+
+    assert asyncio.run(main()).data_head == data_head
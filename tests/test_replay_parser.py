@@ -0,0 +1,332 @@
+import copy, io, math, mmap, random, struct
+
+import pytest
+import blowfish_mod
+import full_replay_parser
+import replay_entities
+import replay_key_schedule
+import legacy_decoder
+import legacy_header
+
+
+def test_key_schedule_matches_replay_key():
+    cipher = blowfish_mod.Blowfish(full_replay_parser.REPLAY_KEY)
+    assert cipher.schedule() == replay_key_schedule.REPLAY_KEY_SCHEDULE
+
+
+def test_cipher_blocks_match_per_block(numpy_mode):
+    cipher = full_replay_parser.get_cipher()
+    plain = bytes(random.Random(1).getrandbits(8) for _ in range(8 * 257))
+    encrypted = cipher.encrypt_blocks(plain)
+    assert encrypted == b''.join(cipher.encrypt(plain[i:i + 8]) for i in range(0, len(plain), 8))
+    assert cipher.decrypt_blocks(encrypted) == plain
+    assert cipher.decrypt_blocks(memoryview(encrypted)) == \
+        b''.join(cipher.decrypt(encrypted[i:i + 8]) for i in range(0, len(encrypted), 8))
+
+
+def test_cipher_blocks_reject_partial_blocks():
+    with pytest.raises(RuntimeError):
+        full_replay_parser.get_cipher().decrypt_blocks(bytes(12))
+
+
+@pytest.mark.parametrize('previous_block', [bytes(8), bytes(range(8))])
+def test_xor_chain(numpy_mode, previous_block):
+    decrypted = bytes(random.Random(2).getrandbits(8) for _ in range(8 * 100))
+    expected = bytearray()
+    previous = previous_block
+    for i in range(0, len(decrypted), 8):
+        previous = bytes(a ^ b for a, b in zip(decrypted[i:i + 8], previous))
+        expected += previous
+    assert bytes(full_replay_parser.xor_chain(decrypted, previous_block)) == bytes(expected)
+
+
+@pytest.mark.parametrize('source_kind', ['path', 'bytes', 'bytearray', 'memoryview', 'file'])
+def test_gameplay_sources(numpy_mode, source_kind, replay_path, replay_bytes, data_head, gameplay):
+    source = {
+        'path': str(replay_path),
+        'bytes': replay_bytes,
+        'bytearray': bytearray(replay_bytes),
+        'memoryview': memoryview(replay_bytes),
+        'file': io.BytesIO(replay_bytes),
+    }[source_kind]
+    replay = full_replay_parser.ReplayWotParse(source, False, keep_source=True)
+    assert replay.data_head == data_head
+    assert bytes(replay.data_gameplay) == gameplay
+    assert b''.join(replay.iter_gameplay(4096)) == gameplay
+
+
+@pytest.mark.parametrize('access', ['pread', 'mmap', 'seek', 'bytes', 'memoryview'])
+def test_read_head_blocks(access, replay_path, replay_bytes, data_head, monkeypatch):
+    source = {'bytes': replay_bytes, 'memoryview': memoryview(replay_bytes)}.get(access, replay_path)
+    if access == 'seek':
+        monkeypatch.delattr(full_replay_parser.os, 'pread', raising=False)
+    for blocks, expected in (((0,), data_head[:1]), ((1,), data_head[1:]), ((0, 1, 5), data_head),
+                             (None, data_head), ((), [])):
+        for fast_json in (True, False):
+            assert full_replay_parser.read_head_blocks(source, blocks, access == 'mmap', fast_json) == expected
+
+
+def test_buffer_source_is_released(replay_path, gameplay):
+    with open(replay_path, 'rb') as replay_file:
+        source = mmap.mmap(replay_file.fileno(), 0, access=mmap.ACCESS_READ)
+        replay = full_replay_parser.ReplayWotParse(source, False)
+        source.close()
+    assert bytes(replay.data_gameplay) == gameplay
+    with pytest.raises(RuntimeError):
+        list(replay.iter_gameplay())
+
+
+def test_decode_gameplay_matches_legacy_decoder(lifecycle_replay_bytes, lifecycle_gameplay):
+    replay = full_replay_parser.ReplayWotParse(lifecycle_replay_bytes, False)
+    replay.decode_gameplay()
+    expected = legacy_decoder.decode_gameplay(lifecycle_gameplay)
+    assert {packet['packet_type'] for packet in expected} == {0, 1, 2, 4, 5, 6, 7, 35}
+    assert replay.decode_gameplay_list == expected
+
+
+def test_compact_packets_match_dict_packets(lifecycle_replay_bytes):
+    replay = full_replay_parser.ReplayWotParse(lifecycle_replay_bytes, False)
+    replay.decode_gameplay()
+    expected = replay.decode_gameplay_list
+    replay.decode_gameplay(compact=True)
+    assert [dict(packet) for packet in replay.decode_gameplay_list] == expected
+    replay.decode_gameplay({1, 35}, compact=True)
+    assert [dict(packet) for packet in replay.decode_gameplay_list] == \
+        [packet for packet in expected if packet['packet_type'] in (1, 35)]
+
+
+def test_seek_and_packets_between(lifecycle_replay_bytes):
+    replay = full_replay_parser.ReplayWotParse(lifecycle_replay_bytes, False)
+    replay.build_time_index(step=2.0)
+    packets = list(replay.iter_packets())
+    clocks = [full_replay_parser.CLOCK_STRUCT.unpack_from(payload)[0] for _, _, _, payload in packets]
+    generator = random.Random(4)
+    for _ in range(200):
+        start_clock, end_clock = sorted(generator.uniform(-1, clocks[-1] + 1) for _ in range(2))
+        expected_start = next((packet[0] for packet, clock in zip(packets, clocks) if clock >= start_clock), None)
+        assert replay.seek(start_clock) == expected_start
+        for packet_types in (None, {1, 35}):
+            expected = [packet[:3] for packet, clock in zip(packets, clocks) if start_clock <= clock <= end_clock and
+                        (packet_types is None or packet[1] in packet_types)]
+            found = [packet[:3] for packet in replay.packets_between(start_clock, end_clock, packet_types)]
+            assert found == expected
+
+
+def test_time_index_round_trip(tmp_path, replay_path, replay_bytes):
+    replay = full_replay_parser.ReplayWotParse(replay_path, False)
+    assert replay.save_time_index() == replay.time_index_path()
+    loaded = full_replay_parser.ReplayWotParse(replay_path, False)
+    assert loaded.load_time_index() == replay.time_index
+    buffered = full_replay_parser.ReplayWotParse(replay_bytes, False)
+    with pytest.raises(ValueError):
+        buffered.save_time_index()
+    assert buffered.save_time_index(tmp_path / 'buffer.tidx') == tmp_path / 'buffer.tidx'
+    assert buffered.load_time_index() is None
+    assert buffered.load_time_index(tmp_path / 'buffer.tidx') == replay.time_index
+
+
+def test_decode_gameplay_partial_stops_early(replay_path):
+    replay = full_replay_parser.ReplayWotParse(replay_path, False)
+    replay.decode_gameplay()
+    packets = replay.decode_gameplay_list
+    clocks = [full_replay_parser.CLOCK_STRUCT.unpack_from(packet['payload'])[0] for packet in packets]
+    streamed = full_replay_parser.ReplayWotParse(replay_path, stats=True)
+    assert streamed.decode_gameplay_partial(chunk_size=1024) == packets
+    full_reads = streamed.stats.stages['read']['calls']
+    max_clock = clocks[len(clocks) // 10]
+    first_chat = next(i for i, packet in enumerate(packets) if packet['packet_type'] == 35)
+    cases = [
+        ({'max_clock': max_clock}, [packet for packet, clock in zip(packets, clocks) if clock <= max_clock]),
+        ({'max_packets': 50}, packets[:50]),
+        ({'until': lambda packet: packet['packet_type'] == 35}, packets[:first_chat + 1]),
+        ({'max_packets': 20, 'packet_types': {35}}, [packet for packet in packets if packet['packet_type'] == 35][:20]),
+    ]
+    for options, expected in cases:
+        partial = full_replay_parser.ReplayWotParse(replay_path, stats=True)
+        assert partial.decode_gameplay_partial(chunk_size=1024, **options) == expected
+        assert partial.stats.stages['read']['calls'] < full_reads
+
+
+def test_spatial_query_radius(lifecycle_replay_bytes):
+    numpy = pytest.importorskip('numpy')
+    import replay_spatial
+    replay = full_replay_parser.ReplayWotParse(lifecycle_replay_bytes, False)
+    spatial_index = replay_spatial.SpatialIndex.from_replay(replay, cell_size=40.0, time_bucket=10.0)
+    columns = spatial_index.columns
+    generator = random.Random(5)
+    for _ in range(200):
+        x, z, radius = generator.uniform(-550, 550), generator.uniform(-550, 550), generator.uniform(1, 300)
+        t0, t1 = sorted(generator.uniform(-5, columns['clock'].max() + 5) for _ in range(2))
+        result = spatial_index.query_radius(x, z, radius, t0, t1)
+        inside = (numpy.hypot(columns['x'] - x, columns['z'] - z) <= radius) & \
+                 (columns['clock'] >= t0) & (columns['clock'] <= t1)
+        assert sorted(zip(result['clock'].tolist(), result['entity_id'].tolist())) == \
+            sorted(zip(columns['clock'][inside].tolist(), columns['entity_id'][inside].tolist()))
+
+
+def test_spatial_index_round_trip(tmp_path, lifecycle_replay_bytes):
+    pytest.importorskip('numpy')
+    import replay_spatial
+    replay = full_replay_parser.ReplayWotParse(lifecycle_replay_bytes, False)
+    spatial_index = replay_spatial.SpatialIndex.from_replay(replay)
+    index_path = spatial_index.save(tmp_path / 'synthetic.sidx.npz')
+    loaded = replay_spatial.SpatialIndex.load(index_path, len(replay.data_gameplay))
+    assert (loaded.keys == spatial_index.keys).all()
+    assert replay_spatial.SpatialIndex.load(index_path, len(replay.data_gameplay) + 1) is None
+
+
+def test_entity_index_active_at(lifecycle_replay_bytes):
+    replay = full_replay_parser.ReplayWotParse(lifecycle_replay_bytes, False)
+    entity_index = replay_entities.build_entity_index(replay)
+    replay.decode_gameplay()
+    events = [(packet['packet_data']['clock'], packet['packet_type'], packet['packet_data']['entity_id'])
+              for packet in replay.decode_gameplay_list
+              if packet['packet_type'] in replay_entities.LIFECYCLE_PACKETS and packet['packet_data'].get('entity_id')]
+    generator = random.Random(6)
+    for clock in [generator.uniform(0, events[-1][0]) for _ in range(200)] + [-1.0, 0.0, math.inf]:
+        active = set()
+        for event_clock, packet_type, entity_id in events:
+            if event_clock > clock: break
+            if packet_type in (replay_entities.LEAVE_PACKET, replay_entities.LEAVE_AOI_PACKET):
+                active.discard(entity_id)
+            else:
+                active.add(entity_id)
+        assert entity_index.active_at(clock) == active
+        assert all(entity_index.is_active(entity_id, clock) == (entity_id in active)
+                   for entity_id in entity_index.entities)
+    entity = next(entity for entity in entity_index.entities.values() if entity.nick_name)
+    assert entity.player['info']['name'] == entity.nick_name
+
+
+def header_variants():
+    import replay_generator
+    for seed, player_index in ((0, 0), (1, 7), (2, 29)):
+        data_head = replay_generator.build_head_blocks(30, seed, player_index)
+        yield data_head
+        yield data_head[:1]
+        unknown_player = copy.deepcopy(data_head)
+        unknown_player[0]['playerName'] = 'not_in_roster'
+        yield unknown_player
+        draw = copy.deepcopy(data_head)
+        draw[1][0]['common']['winnerTeam'] = 0
+        yield draw
+
+
+@pytest.mark.parametrize('data_head', list(header_variants()))
+def test_header_index_matches_legacy_scans(data_head):
+    replay = full_replay_parser.ReplayWotParse.from_head(data_head)
+    legacy = legacy_header.LegacyHeader(data_head)
+    for method in ('get_player_team_id', 'is_player_win', 'get_player_info',
+                   'get_player_team_info', 'get_player_enemy_info'):
+        assert getattr(replay, method)() == getattr(legacy, method)(), method
+    for avatar_id in list(data_head[0]['vehicles'])[::3] + ['0']:
+        assert replay.get_player_info_by_avatar_id(avatar_id) == legacy.get_player_info_by_avatar_id(avatar_id)
+
+
+def test_parse_stats(replay_bytes, data_head):
+    calls = []
+    first_length = struct.unpack_from('<I', replay_bytes, 8)[0]
+    broken_block = 8 + 4 + first_length + 4
+    corrupted = replay_bytes[:broken_block] + b'x' + replay_bytes[broken_block + 1:]
+    stats = full_replay_parser.ParseStats(lambda stage, wall, cpu, processed_bytes: calls.append(stage))
+    replay = full_replay_parser.ReplayWotParse(corrupted, False, stats=stats)
+    replay.decode_gameplay()
+    assert replay.data_head == data_head[:1]
+    assert stats.dropped_head_blocks == 1
+    assert set(stats.stages) == {'head', 'read', 'decrypt', 'xor_chain', 'decompress', 'decode'}
+    assert sorted(calls) == sorted(stage for stage, totals in stats.stages.items() for _ in range(totals['calls']))
+    assert stats.stages['decompress']['bytes'] == len(replay.data_gameplay)
+    assert sum(stats.packet_counts.values()) == len(replay.decode_gameplay_list)
+    assert stats.as_dict()['dropped_head_blocks'] == 1
+
+
+def test_metadata_cache_hits(tmp_path, replay_path):
+    import replay_cache
+    with replay_cache.MetadataCache(tmp_path / 'meta.db', flush_every=2) as cache:
+        entry = cache.get(replay_path)
+        assert cache.get_summary(replay_path) == entry['summary']
+        assert cache.load(replay_path).get_map() == full_replay_parser.ReplayWotParse(replay_path).get_map()
+    with replay_cache.MetadataCache(tmp_path / 'meta.db') as cache:
+        assert cache.get(replay_path) == entry
+        assert not cache.pending_writes
+
+
+@pytest.mark.parametrize('export_format', ['npz', 'parquet'])
+def test_export_round_trip(tmp_path, replay_path, export_format):
+    numpy = pytest.importorskip('numpy')
+    import replay_export
+    if export_format == 'parquet' and replay_export.load_pyarrow() is None:
+        pytest.skip("pyarrow is not installed")
+    results = replay_export.export_replays([replay_path, tmp_path / 'missing.wotreplay'], tmp_path / 'export',
+                                           export_format, row_group_size=1000)
+    assert results[0]['error'] is None
+    assert results[1]['error'].startswith('FileNotFoundError')
+    suffix = '.parquet' if export_format == 'parquet' else '.npz'
+    packets = replay_export.load_table(tmp_path / 'export' / ('packets' + suffix))
+    table = full_replay_parser.ReplayWotParse(replay_path, False).packet_table()
+    for field in table.dtype.names:
+        assert numpy.array_equal(packets[field], table[field], equal_nan=field in ('x', 'y', 'z'))
+    roster = replay_export.load_table(tmp_path / 'export' / ('roster' + suffix))
+    assert len(roster['avatar_id']) == len(full_replay_parser.ReplayWotParse(replay_path).get_header_index().roster)
+
+
+def test_decode_entity_events(data_head):
+    import replay_events
+    import replay_generator
+    replay_events.register_event_layout('position', '<3f', ('x', 'y', 'z'))
+    generator = random.Random(7)
+    expected = {'damage': [], 'position': []}
+    packets = []
+    for i in range(200):
+        clock, entity_id = i * 0.5, generator.randrange(1, 50)
+        if i % 3:
+            values = (generator.randrange(-100, 2000), generator.randrange(1, 50), generator.randrange(0, 255))
+            message_id, kind, layout = 1, 'damage', struct.Struct('<hiB')
+        elif i % 2:
+            values = (float(i), 2.0, -float(i))
+            message_id, kind, layout = 2, 'position', struct.Struct('<3f')
+        else:
+            values, message_id, kind, layout = (), 99, None, struct.Struct('<i')
+        args = layout.pack(*values) if kind else layout.pack(0)
+        packets.append(replay_generator.pack_packet(
+            replay_events.ENTITY_METHOD_PACKET, clock, struct.pack('<iii', entity_id, message_id, len(args)) + args))
+        if kind:
+            expected[kind].append((clock, entity_id) + values)
+    replay = full_replay_parser.ReplayWotParse(
+        replay_generator.build_replay(data_head=data_head, gameplay=b''.join(packets)), False)
+    events = replay_events.decode_entity_events(replay, methods={1: 'damage', 2: 'position'})
+    for kind, rows in expected.items():
+        fields = ('clock', 'entity_id') + replay_events.EVENT_LAYOUTS[kind][1]
+        assert [tuple(row[field] for field in fields) for row in events[kind].rows()] == rows
+    with pytest.raises(RuntimeError):
+        replay_events.decode_entity_events(replay, properties={1: 'health'})
+
+
+@pytest.mark.parametrize('fmt, fields', [('<3f', ('x',)), ('<?', ('flag',)), ('<4s', ('name',)), ('<e', ('half',))])
+def test_event_layout_rejects_mismatched_formats(fmt, fields):
+    import replay_events
+    with pytest.raises(RuntimeError):
+        replay_events.register_event_layout('invalid', fmt, fields)
+
+
+def test_gameplay_cache_round_trip(tmp_path, replay_path, gameplay):
+    import replay_cache
+    cache = replay_cache.GameplayCache(tmp_path / 'gameplay')
+    first = full_replay_parser.ReplayWotParse(replay_path, False, gameplay_cache=cache, stats=True)
+    assert 'decrypt' in first.stats.stages
+    second = full_replay_parser.ReplayWotParse(replay_path, False, gameplay_cache=cache, stats=True)
+    assert 'decrypt' not in second.stats.stages
+    assert bytes(first.data_gameplay) == bytes(second.data_gameplay) == gameplay
+
+
+def test_gameplay_cache_write_failure_is_ignored(tmp_path, replay_path, gameplay, monkeypatch):
+    import replay_cache
+
+    def replace(*args):
+        raise PermissionError("file is mapped by another process")
+
+    monkeypatch.setattr(replay_cache.os, 'replace', replace)
+    cache = replay_cache.GameplayCache(tmp_path / 'gameplay')
+    replay = full_replay_parser.ReplayWotParse(replay_path, False, gameplay_cache=cache)
+    assert bytes(replay.data_gameplay) == gameplay
+    assert list((tmp_path / 'gameplay').iterdir()) == []
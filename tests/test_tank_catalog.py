@@ -0,0 +1,59 @@
+import json, os, time
+
+import pytest
+import tank_catalog
+
+TANKS = {'1': {'short_name': 'T-34'}, '2': {'short_name': 'IS'}, 'bad': {}}
+
+
+class CountingProvider(object):
+    def __init__(self, tanks=TANKS, error=None):
+        self.tanks = tanks
+        self.error = error
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return self.tanks
+
+
+def test_default_snapshot_is_per_user(tmp_path, monkeypatch):
+    monkeypatch.setenv('LOCALAPPDATA' if os.name == 'nt' else 'XDG_CACHE_HOME', str(tmp_path))
+    assert tank_catalog.user_cache_dir() == tmp_path / 'wot_replay_parser'
+
+
+def test_snapshot_is_reused_within_ttl(tmp_path):
+    snapshot_path = tmp_path / 'cache' / 'tanks.json'
+    provider = CountingProvider()
+    catalog = tank_catalog.TankCatalog(provider, snapshot_path)
+    assert catalog.get_short_name(1) == 'T-34'
+    assert catalog.get(3, 'missing') == 'missing'
+    assert json.loads(snapshot_path.read_text(encoding='utf-8')) == TANKS
+    assert tank_catalog.TankCatalog(provider, snapshot_path).get_short_name(2) == 'IS'
+    assert provider.calls == 1
+    assert tank_catalog.TankCatalog(provider, snapshot_path, ttl=0).load() == {1: TANKS['1'], 2: TANKS['2']}
+    assert provider.calls == 2
+
+
+def test_stale_snapshot_is_used_when_provider_fails(tmp_path):
+    snapshot_path = tmp_path / 'tanks.json'
+    snapshot_path.write_text(json.dumps(TANKS), encoding='utf-8')
+    stale = time.time() - 2 * tank_catalog.CATALOG_TTL
+    os.utime(snapshot_path, (stale, stale))
+    provider = CountingProvider(error=ConnectionError("api is down"))
+    assert tank_catalog.TankCatalog(provider, snapshot_path).get_short_name(1) == 'T-34'
+    assert provider.calls == 1
+    with pytest.raises(ConnectionError):
+        tank_catalog.TankCatalog(provider, tmp_path / 'missing.json').load()
+
+
+def test_local_tank_provider(tmp_path):
+    tanks_path = tmp_path / 'tanks.json'
+    tanks_path.write_text(json.dumps(TANKS), encoding='utf-8')
+    for source in (TANKS, tanks_path, str(tanks_path)):
+        catalog = tank_catalog.TankCatalog(tank_catalog.LocalTankProvider(source), snapshot_path=None)
+        assert catalog.get_short_name(2) == 'IS'
+        assert catalog.get_short_name(3, 'unknown') == 'unknown'
+    assert not list(tmp_path.glob('*.tmp'))